@@ -0,0 +1,142 @@
+import json
+import sys
+
+# Columns of the `birds` table in shared/schema.ts, in bird_data.json order
+BIRD_FIELDS = (
+    "id", "name", "scientificName", "family", "description", "identification",
+    "sexualDimorphism", "behavior", "habitat", "diet", "sizeLength", "weightG",
+    "wikipediaUrl", "wikiavesUrl", "imageUrl", "customImageUrl",
+)
+
+# iNaturalist fields written by resolve_taxa.py; inatTaxonId is null when no taxon matched
+TAXON_FIELDS = (
+    "inatTaxonId", "inatTaxonName", "inatCommonName", "inatPhotoUrl", "inatObservationsCount",
+)
+
+# Text repeated across many birds; each distinct value is stored once
+INTERNED_FIELDS = frozenset([
+    "family", "sexualDimorphism", "habitat", "diet", "sizeLength", "weightG", "inatTaxonName",
+])
+
+_FIELDS = BIRD_FIELDS + TAXON_FIELDS
+_FIELD_SET = frozenset(_FIELDS)
+
+class BirdRecord:
+    """
+    A catalog bird with one slot per field instead of a per-record dict
+
+    Fields missing from the JSON record stay unset and are left out again
+    when it is dumped; unknown keys are kept in `extra`. Records also support
+    the dict operations the scripts use (bird['name'], bird.get(...), `in`,
+    update), so they can be passed wherever a bird dict was expected.
+    Assigning through bird['field'] interns low-cardinality text; plain
+    attribute assignment does not.
+    """
+
+    __slots__ = _FIELDS + ("extra",)
+
+    def __init__(self, fields=None, **kwargs):
+        self.extra = None
+        if fields:
+            self.update(fields)
+        if kwargs:
+            self.update(kwargs)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data)
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def __setitem__(self, key, value):
+        if key in _FIELD_SET:
+            if key in INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key):
+        if key in _FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self.extra is None:
+            raise KeyError(key)
+        else:
+            del self.extra[key]
+
+    def __contains__(self, key):
+        if key in _FIELD_SET:
+            return hasattr(self, key)
+        return self.extra is not None and key in self.extra
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        keys = [field for field in _FIELDS if hasattr(self, field)]
+        if self.extra:
+            keys.extend(self.extra)
+        return keys
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def update(self, other=(), **kwargs):
+        items = other.items() if hasattr(other, "items") else other
+        for key, value in items:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, (BirdRecord, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"BirdRecord({self.to_dict()!r})"
+
+def to_json(obj):
+    """
+    json.dump `default` hook that serializes bird records as plain objects
+    """
+    if isinstance(obj, BirdRecord):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def load_birds(json_path):
+    """
+    Load the bird data JSON file as a list of bird records
+    """
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, list) or not all(isinstance(b, dict) for b in data):
+        raise ValueError(f"{json_path} must contain a list of bird objects")
+    return [BirdRecord(b) for b in data]
@@ -1,21 +1,39 @@
-import pandas as pd
+from lazy_import import lazy_import
+from merge_workbooks import COLUMN_MAP, PREFERRED_SHEET, newest_workbook
 
-# Path to the Excel file
-excel_path = "attached_assets/aves_Toca_v2 (1).xlsx"
+# pandas is only loaded once the Excel file is actually read
+pd = lazy_import('pandas')
 
-# Read the Excel file
-df = pd.read_excel(excel_path)
+def check_excel(excel_path=None):
+    """
+    Print the columns and the first picture entries of an Excel file, by default the newest workbook
+    """
+    excel_path = excel_path or newest_workbook()
+    if excel_path is None:
+        print("Error: no workbooks found")
+        return
+    print(f"Reading {excel_path}")
 
-# Check and print the columns
-print("Columns in Excel file:", df.columns.tolist())
+    # Read the curated sheet of the editorial workbooks, or else the first one
+    with pd.ExcelFile(excel_path) as workbook:
+        sheet = PREFERRED_SHEET if PREFERRED_SHEET in workbook.sheet_names else 0
+        df = workbook.parse(sheet)
+    
+    # Check and print the columns
+    print("Columns in Excel file:", df.columns.tolist())
+    
+    # Find the picture and name columns of whichever layout the workbook uses
+    picture = next((c for c in df.columns if COLUMN_MAP.get(c) == "imageUrl"), None)
+    name = next((c for c in df.columns if COLUMN_MAP.get(c) == "name"), None)
+    if picture:
+        # Print the first 5 entries in the picture column
+        print(f"\nFirst 5 entries in the {picture} column:")
+        for i, row in df.head(5).iterrows():
+            bird_name = row.get(name, 'Unknown') if name else 'Unknown'
+            picture_url = row.get(picture, 'No URL')
+            print(f"{bird_name}: {picture_url}")
+    else:
+        print("\nNo picture column found in the Excel file.")
 
-# Check if 'Picture' column exists
-if 'Picture' in df.columns:
-    # Print the first 5 entries in the Picture column
-    print("\nFirst 5 entries in the Picture column:")
-    for i, row in df.head(5).iterrows():
-        bird_name = row.get('Nome Comum', 'Unknown')
-        picture_url = row.get('Picture', 'No URL')
-        print(f"{bird_name}: {picture_url}")
-else:
-    print("\nNo 'Picture' column found in the Excel file.")
\ No newline at end of file
+if __name__ == "__main__":
+    check_excel()
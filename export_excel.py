@@ -0,0 +1,111 @@
+from bird_record import load_birds
+from merge_workbooks import PREFERRED_SHEET
+
+JSON_PATH = "bird_data.json"
+OUTPUT_PATH = "bird_data_export.xlsx"
+
+# Exported columns, using the headers update_bird_data_from_excel and
+# merge_workbooks read, so edited exports can be fed back into the pipeline
+EXPORT_COLUMNS = [
+    ("id", "id"),
+    ("Nome Comum", "name"),
+    ("Espécie", "scientificName"),
+    ("family", "family"),
+    ("Extract 1", "description"),
+    ("identification_pt", "identification"),
+    ("Dimorfismo sexual", "sexualDimorphism"),
+    ("behavior_pt", "behavior"),
+    ("habitat", "habitat"),
+    ("Alimentação", "diet"),
+    ("size_length_cm", "sizeLength"),
+    ("weight_g", "weightG"),
+    ("wikipedia", "wikipediaUrl"),
+    ("link", "wikiavesUrl"),
+    ("Picture", "imageUrl"),
+    ("custom_image_url", "customImageUrl"),
+]
+
+LINK_FIELDS = {"wikipediaUrl", "wikiavesUrl", "imageUrl", "customImageUrl"}
+
+COLUMN_WIDTHS = {
+    "id": 6, "name": 28, "scientificName": 28, "family": 18, "description": 60,
+    "identification": 40, "behavior": 40, "habitat": 40, "diet": 30,
+}
+DEFAULT_WIDTH = 16
+
+HEADER_FILL = "0F783A"
+
+def export_rows(sheet, birds):
+    """
+    Yield one row per bird, with link cells as hyperlinks
+
+    Only link cells become cell objects, and they share one Font; every
+    other value is written as-is.
+    """
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    link_font = Font(color="0563C1", underline="single")
+    for bird in birds:
+        row = []
+        for _, field in EXPORT_COLUMNS:
+            value = bird.get(field)
+            if field in LINK_FIELDS and value and value.startswith(("http://", "https://")):
+                cell = WriteOnlyCell(sheet, value=value)
+                cell.hyperlink = value
+                cell.font = link_font
+                row.append(cell)
+            else:
+                row.append(value)
+        yield row
+
+def export_catalog_excel(json_path=JSON_PATH, output_path=OUTPUT_PATH):
+    """
+    Stream the bird data JSON into a formatted workbook editors can work on
+    """
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill
+    from openpyxl.utils import get_column_letter
+
+    print(f"Exporting {json_path} to {output_path}...")
+    try:
+        birds = load_birds(json_path)
+    except Exception as e:
+        print(f"Error reading {json_path}: {str(e)}")
+        return False
+
+    try:
+        # Write-only mode streams rows to disk instead of keeping every cell in memory
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet(PREFERRED_SHEET)
+
+        # Sheet layout has to be set before the first row is written
+        for i, (_, field) in enumerate(EXPORT_COLUMNS, start=1):
+            sheet.column_dimensions[get_column_letter(i)].width = COLUMN_WIDTHS.get(field, DEFAULT_WIDTH)
+        sheet.freeze_panes = "C2"
+        sheet.auto_filter.ref = f"A1:{get_column_letter(len(EXPORT_COLUMNS))}{len(birds) + 1}"
+
+        header_font = Font(bold=True, color="FFFFFF")
+        header_fill = PatternFill("solid", fgColor=HEADER_FILL)
+        header = []
+        for title, _ in EXPORT_COLUMNS:
+            cell = WriteOnlyCell(sheet, value=title)
+            cell.font = header_font
+            cell.fill = header_fill
+            header.append(cell)
+        sheet.append(header)
+
+        for row in export_rows(sheet, birds):
+            sheet.append(row)
+
+        workbook.save(output_path)
+    except Exception as e:
+        print(f"Error writing {output_path}: {str(e)}")
+        return False
+
+    print(f"Exported {len(birds)} birds to {output_path}")
+    return True
+
+if __name__ == "__main__":
+    export_catalog_excel()
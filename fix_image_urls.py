@@ -1,4 +1,5 @@
-import json
+from bird_record import load_birds
+from publish import publish_catalog
 
 # Define direct image URLs for birds with known issues
 DIRECT_URLS = {
@@ -12,34 +13,40 @@ DIRECT_URLS = {
     "Gavião asa de telha": "https://upload.wikimedia.org/wikipedia/commons/a/a0/Parabuteo_unicinctus_-falconry_display-8a.jpg"
 }
 
+def fix_bird_image(bird):
+    """
+    Fix the image URL of a single bird, returning True if it was changed
+    """
+    # If the bird name is in our direct URLs list, use that URL
+    if bird.name in DIRECT_URLS:
+        print(f"Using predefined direct URL for {bird.name}")
+        bird.imageUrl = DIRECT_URLS[bird.name]
+        return True
+    # For all other birds, convert wikipedia special path to direct URLs
+    elif 'Special:FilePath' in bird.imageUrl:
+        filename = bird.imageUrl.split('/')[-1]
+        # Use the upload.wikimedia.org direct URL format
+        bird.imageUrl = f"https://upload.wikimedia.org/wikipedia/commons/thumb/latest/{filename}/500px-{filename}"
+        print(f"Converted URL for {bird.name}")
+        return True
+    return False
+
 def fix_bird_images(json_path):
     """
     Fix the problematic image URLs in the bird data JSON file
     """
     try:
         # Read the JSON file
-        with open(json_path, 'r', encoding='utf-8') as f:
-            birds_data = json.load(f)
+        birds_data = load_birds(json_path)
         
         # Process each bird
         updated_count = 0
         for bird in birds_data:
-            # If the bird name is in our direct URLs list, use that URL
-            if bird['name'] in DIRECT_URLS:
-                print(f"Using predefined direct URL for {bird['name']}")
-                bird['imageUrl'] = DIRECT_URLS[bird['name']]
-                updated_count += 1
-            # For all other birds, convert wikipedia special path to direct URLs
-            elif 'Special:FilePath' in bird['imageUrl']:
-                filename = bird['imageUrl'].split('/')[-1]
-                # Use the upload.wikimedia.org direct URL format
-                bird['imageUrl'] = f"https://upload.wikimedia.org/wikipedia/commons/thumb/latest/{filename}/500px-{filename}"
-                print(f"Converted URL for {bird['name']}")
+            if fix_bird_image(bird):
                 updated_count += 1
         
-        # Write the updated data back to the JSON file
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(birds_data, f, ensure_ascii=False, indent=2)
+        # Validate the updated data and atomically replace the JSON file
+        publish_catalog(birds_data, json_path)
         
         print(f"Updated {updated_count} bird images in {json_path}")
         return True
@@ -1,4 +1,5 @@
-import json
+from bird_record import load_birds
+from publish import publish_catalog
 
 def fix_problem_birds():
     """
@@ -11,8 +12,7 @@ def fix_problem_birds():
     
     try:
         # Load the existing JSON data
-        with open(json_path, 'r', encoding='utf-8') as f:
-            bird_data = json.load(f)
+        bird_data = load_birds(json_path)
         
         # Hardcoded image URLs for known problematic birds
         # These are direct URLs to high-quality images for each bird
@@ -30,26 +30,27 @@ def fix_problem_birds():
         # Update the JSON data with the hardcoded image URLs
         update_count = 0
         for bird in bird_data:
-            if bird['name'] in problem_birds:
+            if bird.name in problem_birds:
                 old_url = bird.get('imageUrl', '')
-                new_url = problem_birds[bird['name']]
+                new_url = problem_birds[bird.name]
                 
                 # Only update if the URL is actually different
                 if old_url != new_url:
-                    bird['imageUrl'] = new_url
+                    bird.imageUrl = new_url
                     update_count += 1
-                    print(f"Updated {bird['name']} with new image URL: {new_url}")
+                    print(f"Updated {bird.name} with new image URL: {new_url}")
         
         print(f"Updated {update_count} birds with new image URLs")
         
-        # Save the updated JSON data
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(bird_data, f, ensure_ascii=False, indent=2)
+        # Validate the updated data and atomically replace the JSON file
+        publish_catalog(bird_data, json_path)
         
         print(f"Successfully updated JSON file at {json_path}")
+        return True
         
     except Exception as e:
         print(f"Error fixing problematic birds: {str(e)}")
+        return False
 
 if __name__ == "__main__":
     fix_problem_birds()
\ No newline at end of file
@@ -0,0 +1,309 @@
+import json
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from lazy_import import lazy_import
+
+requests = lazy_import('requests')
+
+INAT_API = "https://api.inaturalist.org/v1"
+GBIF_API = "https://api.gbif.org/v1"
+
+SNAPSHOT_PATH = "lab_snapshot.sqlite"
+EXPORT_DIR = "lab_snapshot"
+
+# Same search areas as the /api/lab endpoints in server/routes.ts
+INAT_AREA = {"lat": -23.862969, "lng": -45.321893, "radius": 17}
+GBIF_DATASET_KEY = "4fa7b334-ce0d-4e88-aaae-2e0c138d049e"
+GBIF_AREA = {"decimalLatitude": "-24.2,-23.5", "decimalLongitude": "-45.6,-45.0"}
+
+INAT_PER_PAGE = 200
+INAT_SPECIES_PER_PAGE = 500
+# iNat refuses to page past 10,000 results
+INAT_MAX_RESULTS = 10000
+GBIF_LIMIT = 300
+
+# Southern Hemisphere seasons, as in getSouthernHemisphereSeason (server/storage.ts)
+SEASONS = {
+    12: "summer", 1: "summer", 2: "summer",
+    3: "autumn", 4: "autumn", 5: "autumn",
+    6: "winter", 7: "winter", 8: "winter",
+    9: "spring", 10: "spring", 11: "spring",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS inat_observations (
+    id INTEGER PRIMARY KEY,
+    taxon_id INTEGER,
+    taxon_name TEXT,
+    common_name TEXT,
+    photo_url TEXT,
+    observed_on TEXT,
+    month INTEGER,
+    place_guess TEXT,
+    user_login TEXT,
+    location TEXT
+);
+CREATE INDEX IF NOT EXISTS inat_observations_observed_on ON inat_observations (observed_on);
+CREATE TABLE IF NOT EXISTS inat_species_counts (
+    taxon_id INTEGER PRIMARY KEY,
+    name TEXT,
+    common_name TEXT,
+    photo_url TEXT,
+    count INTEGER
+);
+CREATE TABLE IF NOT EXISTS gbif_occurrences (
+    key INTEGER PRIMARY KEY,
+    species TEXT,
+    vernacular_name TEXT,
+    event_date TEXT,
+    year INTEGER,
+    month INTEGER,
+    latitude REAL,
+    longitude REAL
+);
+CREATE INDEX IF NOT EXISTS gbif_occurrences_event_date ON gbif_occurrences (event_date);
+CREATE TABLE IF NOT EXISTS month_species_counts (
+    source TEXT,
+    month INTEGER,
+    season TEXT,
+    species TEXT,
+    count INTEGER,
+    PRIMARY KEY (source, month, species)
+);
+"""
+
+def open_snapshot(path=SNAPSHOT_PATH):
+    """
+    Open the snapshot database, creating its tables if needed
+    """
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+def _get_json(url, params):
+    response = requests.get(url, params=params, headers={'User-Agent': 'tocabirds-lab-snapshot'}, timeout=30)
+    response.raise_for_status()
+    return response.json()
+
+def fetch_pages(url, params, page_size, total_key, workers=4, max_results=None):
+    """
+    Fetch every page of a paginated iNat-style endpoint
+
+    The first page gives the total, then the remaining pages are fetched concurrently.
+    """
+    first = _get_json(url, {**params, "per_page": page_size, "page": 1})
+    results = list(first.get("results", []))
+    total = first.get(total_key, len(results))
+    if max_results is not None:
+        total = min(total, max_results)
+    pages = range(2, -(-total // page_size) + 1)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for data in pool.map(lambda p: _get_json(url, {**params, "per_page": page_size, "page": p}), pages):
+            results.extend(data.get("results", []))
+    return results
+
+def fetch_offsets(url, params, limit, workers=4):
+    """
+    Fetch every page of a GBIF-style endpoint paginated by offset and limit
+    """
+    first = _get_json(url, {**params, "limit": limit, "offset": 0})
+    results = list(first.get("results", []))
+    offsets = range(limit, first.get("count", len(results)), limit)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for data in pool.map(lambda o: _get_json(url, {**params, "limit": limit, "offset": o}), offsets):
+            results.extend(data.get("results", []))
+    return results
+
+def _month_of(date_text):
+    try:
+        return int(date_text.split("-")[1])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+def _latest(conn, table, column):
+    return conn.execute(f"SELECT MAX({column}) FROM {table}").fetchone()[0]
+
+def update_inat(conn, api=INAT_API, workers=4):
+    """
+    Fetch iNat observations observed on or after the newest one in the snapshot
+    """
+    params = {"taxon_name": "Aves", **INAT_AREA, "order_by": "observed_on", "order": "asc"}
+    since = _latest(conn, "inat_observations", "observed_on")
+    if since:
+        params["d1"] = since
+
+    rows = []
+    for obs in fetch_pages(f"{api}/observations", params, INAT_PER_PAGE, "total_results",
+                           workers, INAT_MAX_RESULTS):
+        taxon = obs.get("taxon") or {}
+        rows.append((
+            obs["id"], taxon.get("id"), taxon.get("name"), taxon.get("preferred_common_name"),
+            (taxon.get("default_photo") or {}).get("square_url"),
+            obs.get("observed_on"), _month_of(obs.get("observed_on")), obs.get("place_guess"),
+            (obs.get("user") or {}).get("login"), obs.get("location"),
+        ))
+    conn.executemany("INSERT OR REPLACE INTO inat_observations VALUES (?,?,?,?,?,?,?,?,?,?)", rows)
+    return len(rows)
+
+def update_inat_species(conn, api=INAT_API, workers=4):
+    """
+    Replace the iNat species counts; they are totals, so they are always fetched in full
+    """
+    params = {"iconic_taxa[]": "Aves", **INAT_AREA}
+    rows = []
+    for item in fetch_pages(f"{api}/observations/species_counts", params, INAT_SPECIES_PER_PAGE,
+                            "total_results", workers):
+        taxon = item.get("taxon") or {}
+        rows.append((
+            taxon.get("id"), taxon.get("name"), taxon.get("preferred_common_name"),
+            (taxon.get("default_photo") or {}).get("square_url"), item.get("count"),
+        ))
+    conn.execute("DELETE FROM inat_species_counts")
+    conn.executemany("INSERT OR REPLACE INTO inat_species_counts VALUES (?,?,?,?,?)", rows)
+    return len(rows)
+
+def update_gbif(conn, api=GBIF_API, workers=4):
+    """
+    Fetch GBIF occurrences with an event date on or after the newest one in the snapshot
+    """
+    params = {"datasetKey": GBIF_DATASET_KEY, **GBIF_AREA}
+    since = _latest(conn, "gbif_occurrences", "event_date")
+    if since:
+        params["eventDate"] = f"{since[:10]},*"
+
+    rows = []
+    for occ in fetch_offsets(f"{api}/occurrence/search", params, GBIF_LIMIT, workers):
+        rows.append((
+            occ["key"], occ.get("species"), occ.get("vernacularName"), occ.get("eventDate"),
+            occ.get("year"), occ.get("month"), occ.get("decimalLatitude"), occ.get("decimalLongitude"),
+        ))
+    conn.executemany("INSERT OR REPLACE INTO gbif_occurrences VALUES (?,?,?,?,?,?,?,?)", rows)
+    return len(rows)
+
+def rebuild_aggregates(conn):
+    """
+    Recompute the per-month species counts of both sources
+    """
+    conn.execute("DELETE FROM month_species_counts")
+    rows = conn.execute("""
+        SELECT 'inat', month, taxon_name, COUNT(*) FROM inat_observations
+        WHERE month IS NOT NULL AND taxon_name IS NOT NULL GROUP BY month, taxon_name
+        UNION ALL
+        SELECT 'gbif', month, species, COUNT(*) FROM gbif_occurrences
+        WHERE month IS NOT NULL AND species IS NOT NULL GROUP BY month, species
+    """).fetchall()
+    conn.executemany(
+        "INSERT INTO month_species_counts VALUES (?,?,?,?,?)",
+        [(source, month, SEASONS.get(month), species, count) for source, month, species, count in rows],
+    )
+
+def aggregates(conn):
+    """
+    Get observation and species counts per month and per season for each source
+    """
+    result = {}
+    for source, month, season, species, count in conn.execute(
+            "SELECT source, month, season, species, count FROM month_species_counts ORDER BY species"):
+        by_source = result.setdefault(source, {"months": {}, "seasons": {}})
+        for group in (by_source["months"].setdefault(str(month), {}),
+                      by_source["seasons"].setdefault(season, {})):
+            group["observations"] = group.get("observations", 0) + count
+            group.setdefault("species", {})
+            group["species"][species] = group["species"].get(species, 0) + count
+    return result
+
+def inat_response(conn):
+    """
+    Rebuild the /api/lab/inat payload from the snapshot
+    """
+    results = []
+    for row in conn.execute("""
+            SELECT id, taxon_id, taxon_name, common_name, photo_url, observed_on,
+                   place_guess, user_login, location
+            FROM inat_observations ORDER BY observed_on DESC, id DESC"""):
+        obs_id, taxon_id, name, common_name, photo, observed_on, place, login, location = row
+        taxon = None
+        if name:
+            taxon = {"id": taxon_id, "name": name, "preferred_common_name": common_name}
+            if photo:
+                taxon["default_photo"] = {"square_url": photo}
+        results.append({
+            "id": obs_id, "taxon": taxon, "observed_on": observed_on,
+            "place_guess": place, "user": {"login": login}, "location": location,
+        })
+    return {"total_results": len(results), "results": results}
+
+def inat_species_response(conn):
+    """
+    Rebuild the /api/lab/inat-species payload from the snapshot
+    """
+    results = []
+    for taxon_id, name, common_name, photo, count in conn.execute(
+            "SELECT taxon_id, name, common_name, photo_url, count FROM inat_species_counts "
+            "ORDER BY count DESC, name"):
+        taxon = {"id": taxon_id, "name": name, "preferred_common_name": common_name}
+        if photo:
+            taxon["default_photo"] = {"square_url": photo}
+        results.append({"count": count, "taxon": taxon})
+    return {"total_results": len(results), "results": results}
+
+def gbif_response(conn):
+    """
+    Rebuild the /api/lab/gbif payload from the snapshot
+    """
+    results = [
+        {
+            "key": key, "species": species, "vernacularName": vernacular, "eventDate": event_date,
+            "year": year, "month": month, "decimalLatitude": lat, "decimalLongitude": lng,
+        }
+        for key, species, vernacular, event_date, year, month, lat, lng in conn.execute(
+            "SELECT key, species, vernacular_name, event_date, year, month, latitude, longitude "
+            "FROM gbif_occurrences ORDER BY event_date DESC, key DESC")
+    ]
+    return {"count": len(results), "results": results}
+
+def export_snapshot(conn, export_dir=EXPORT_DIR):
+    """
+    Write the endpoint payloads and aggregates as JSON files the server can send as-is
+    """
+    os.makedirs(export_dir, exist_ok=True)
+    payloads = {
+        "inat.json": inat_response(conn),
+        "inat-species.json": inat_species_response(conn),
+        "gbif.json": gbif_response(conn),
+        "aggregates.json": aggregates(conn),
+    }
+    for filename, payload in payloads.items():
+        with open(os.path.join(export_dir, filename), 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+
+def update_lab_snapshot(path=SNAPSHOT_PATH, export_dir=EXPORT_DIR,
+                        inat_api=INAT_API, gbif_api=GBIF_API, workers=4):
+    """
+    Incrementally update the iNaturalist/GBIF snapshot and export it for the server
+    """
+    print(f"Updating lab snapshot at {path}...")
+    conn = open_snapshot(path)
+    try:
+        with conn:
+            inat_count = update_inat(conn, inat_api, workers)
+            species_count = update_inat_species(conn, inat_api, workers)
+            gbif_count = update_gbif(conn, gbif_api, workers)
+            rebuild_aggregates(conn)
+        print(f"Fetched {inat_count} iNat observations, {species_count} iNat species "
+              f"and {gbif_count} GBIF occurrences")
+        export_snapshot(conn, export_dir)
+        print(f"Exported lab snapshot to {export_dir}")
+        return True
+    except Exception as e:
+        print(f"Error updating lab snapshot: {str(e)}")
+        return False
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    update_lab_snapshot()
@@ -0,0 +1,34 @@
+import importlib.util
+import sys
+
+def lazy_import(name):
+    """
+    Return the module `name` without executing it until an attribute is first used
+
+    The first attribute access is not thread-safe on Python 3.11: threads that
+    touch a still-unloaded module at the same time can see it half-initialized.
+    Call ensure_loaded() in the main thread before handing a lazy module to a
+    thread pool.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    
+    # Wrap the real loader so the module body only runs on first attribute access
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+def ensure_loaded(module):
+    """
+    Run a lazy module's body now, if it hasn't run yet, and return the module
+    """
+    # Any attribute access triggers the load
+    module.__name__
+    return module
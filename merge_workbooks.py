@@ -0,0 +1,220 @@
+import glob
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+ASSETS_DIR = "attached_assets"
+OUTPUT_PATH = "merged_source.json"
+
+# Workbook snapshots editors drop into attached_assets
+WORKBOOK_PATTERNS = [
+    "birds_catalogue_final_*.xlsx",
+    "birds_catalogue_editorial_pt_*.xlsx",
+    "birds_*.xlsx",
+    "aves_Toca_v2*.xlsx",
+]
+
+# Sheet holding the curated catalogue in the editorial workbooks
+PREFERRED_SHEET = "catalogue_editorial_pt"
+
+# Column headers used by the different workbook layouts, mapped to bird_data.json fields
+COLUMN_MAP = {
+    "Nome Comum": "name",
+    "name": "name",
+    "common_name": "name",
+    "Espécie": "scientificName",
+    "scientific_name": "scientificName",
+    "family": "family",
+    "Extract 1": "description",
+    "description": "description",
+    "card_text_pt": "description",
+    "identification_pt": "identification",
+    "Dimorfismo sexual": "sexualDimorphism",
+    "sexual_dimorphism_pt": "sexualDimorphism",
+    "behavior_pt": "behavior",
+    "habitat": "habitat",
+    "habitat_pt": "habitat",
+    "Alimentação": "diet",
+    "diet": "diet",
+    "diet_pt": "diet",
+    "size_length_cm": "sizeLength",
+    "weight_g": "weightG",
+    "wikipedia": "wikipediaUrl",
+    "wikipedia_url": "wikipediaUrl",
+    "link": "wikiavesUrl",
+    "wikiaves_url": "wikiavesUrl",
+    "Picture": "imageUrl",
+    "image_url": "imageUrl",
+    "custom_image_url": "customImageUrl",
+}
+
+# Millisecond epoch suffix appended to uploaded files, e.g. birds_1777765095634.xlsx
+TIMESTAMP_RE = re.compile(r"_(\d{13})(?:\D|$)")
+
+def find_workbooks(assets_dir=ASSETS_DIR):
+    """
+    List every source workbook in the assets directory, without duplicates
+    """
+    paths = set()
+    for pattern in WORKBOOK_PATTERNS:
+        paths.update(glob.glob(os.path.join(assets_dir, pattern)))
+    return sorted(paths)
+
+def workbook_timestamp(path):
+    """
+    Get the snapshot time of a workbook from its file name, falling back to its mtime
+    """
+    match = TIMESTAMP_RE.search(os.path.basename(path))
+    if match:
+        return int(match.group(1)) / 1000
+    return os.path.getmtime(path)
+
+def merge_order(path, timestamp):
+    """
+    Get the sort key ordering workbooks from oldest to newest
+
+    Snapshots named with their upload time rank above every workbook without
+    one, whose mtime only records when it was copied or checked out; the mtime
+    just orders the un-timestamped workbooks among themselves.
+    """
+    named = TIMESTAMP_RE.search(os.path.basename(path)) is not None
+    return (named, timestamp, path)
+
+def species_key(record):
+    """
+    Get the key used to match the same species across workbooks
+    """
+    value = record.get("scientificName") or record.get("name")
+    if not value:
+        return None
+    return " ".join(value.split()).casefold()
+
+def _cell_to_text(value):
+    """
+    Convert a cell value to the string form used in bird_data.json
+    """
+    if value is None:
+        return None
+    if isinstance(value, float):
+        # Numbers are stored as strings with a decimal comma, e.g. "13,5"
+        value = f"{value:g}".replace(".", ",")
+    text = str(value).strip()
+    return text or None
+
+def parse_workbook(path):
+    """
+    Read a workbook into a list of records keyed by bird_data.json field names
+    """
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        if PREFERRED_SHEET in workbook.sheetnames:
+            sheet = workbook[PREFERRED_SHEET]
+        else:
+            sheet = workbook.worksheets[0]
+
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None) or ()
+        columns = [(i, COLUMN_MAP[h]) for i, h in enumerate(header) if h in COLUMN_MAP]
+
+        records = []
+        for row in rows:
+            record = {}
+            for i, field in columns:
+                text = _cell_to_text(row[i]) if i < len(row) else None
+                if text is not None:
+                    record[field] = text
+            if species_key(record):
+                records.append(record)
+        return records
+    finally:
+        workbook.close()
+
+def merge_records(parsed):
+    """
+    Merge parsed workbooks into one table, keeping the newest value per species and field
+
+    `parsed` is a list of (path, timestamp, records) tuples. Each merged record
+    carries a `provenance` dict naming the workbook each field came from.
+    """
+    fields = {}
+    provenance = {}
+    for path, timestamp, records in sorted(parsed, key=lambda p: merge_order(p[0], p[1])):
+        source = os.path.basename(path)
+        for record in records:
+            key = species_key(record)
+            fields.setdefault(key, {}).update(record)
+            sources = provenance.setdefault(key, {})
+            for field in record:
+                sources[field] = {"source": source, "timestamp": timestamp}
+    return [
+        {"key": key, **fields[key], "provenance": provenance[key]}
+        for key in sorted(fields)
+    ]
+
+def _parse_with_timestamp(path):
+    return path, workbook_timestamp(path), parse_workbook(path)
+
+def parse_workbooks(paths, workers=None):
+    """
+    Parse workbooks on a process pool into (path, timestamp, records) tuples
+    """
+    if workers == 1 or len(paths) <= 1:
+        return [_parse_with_timestamp(p) for p in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_parse_with_timestamp, paths))
+
+def merge_workbooks(assets_dir=ASSETS_DIR, output_path=OUTPUT_PATH, workers=None):
+    """
+    Parse every source workbook in parallel and write the merged source table
+    """
+    print(f"Merging workbooks from {assets_dir}...")
+    paths = find_workbooks(assets_dir)
+    if not paths:
+        print(f"Error: no workbooks found in {assets_dir}")
+        return None
+
+    try:
+        parsed = parse_workbooks(paths, workers)
+    except Exception as e:
+        print(f"Error reading workbooks: {str(e)}")
+        return None
+
+    for path, _, records in parsed:
+        print(f"Read {len(records)} birds from {os.path.basename(path)}")
+
+    merged = merge_records(parsed)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(merged, f, ensure_ascii=False, indent=2)
+
+    print(f"Wrote {len(merged)} merged birds to {output_path}")
+    return merged
+
+def newest_workbook(assets_dir=ASSETS_DIR):
+    """
+    Get the most recent source workbook, or None if there is none
+    """
+    paths = find_workbooks(assets_dir)
+    if not paths:
+        return None
+    return max(paths, key=lambda p: merge_order(p, workbook_timestamp(p)))
+
+def load_merged_source(assets_dir=ASSETS_DIR, merged_path=OUTPUT_PATH, workers=None):
+    """
+    Get the merged source table, re-merging the workbooks if `merged_path` is missing or stale
+
+    Returns None when there are no workbooks to merge.
+    """
+    paths = find_workbooks(assets_dir)
+    if paths and os.path.exists(merged_path):
+        written = os.path.getmtime(merged_path)
+        if all(os.path.getmtime(p) <= written for p in paths):
+            with open(merged_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    return merge_workbooks(assets_dir, merged_path, workers)
+
+if __name__ == "__main__":
+    merge_workbooks()
@@ -0,0 +1,200 @@
+"""
+Single entry point for the bird data pipeline scripts.
+
+Usage: python pipeline.py <command> [options]
+
+Each command imports its script only when it runs, so heavy dependencies
+(pandas, requests, bs4) are never loaded by commands that don't need them.
+Commands that rewrite bird_data.json are followed by a validation pass and
+exit non-zero if the catalog no longer matches shared/schema.ts.
+"""
+import argparse
+import sys
+
+JSON_PATH = "bird_data.json"
+
+def cmd_update_excel(args):
+    from update_bird_data import update_bird_data_from_excel
+    return update_bird_data_from_excel(args.assets_dir, args.json_path, args.merged)
+
+def cmd_check_excel(args):
+    from check_excel import check_excel
+    check_excel(args.excel_path)
+
+def cmd_scrape_wikiaves(args):
+    from scrape_wikiaves import update_bird_data_from_wikiaves
+    return update_bird_data_from_wikiaves(args.assets_dir, args.json_path, args.merged)
+
+def cmd_scrape_wiki_images(args):
+    from scrape_wiki_images import fix_bird_data_json
+    return fix_bird_data_json(args.json_path)
+
+def cmd_fix_image_urls(args):
+    from fix_image_urls import fix_bird_images
+    return fix_bird_images(args.json_path)
+
+def cmd_fix_problem_birds(args):
+    from fix_problem_birds import fix_problem_birds
+    return fix_problem_birds()
+
+def cmd_merge(args):
+    from merge_workbooks import merge_workbooks
+    return merge_workbooks(args.assets_dir, args.output, args.workers) is not None
+
+def cmd_watch(args):
+    from watch_catalog import watch_catalog
+    watch_catalog(args.assets_dir, args.json_path, args.debounce)
+
+def cmd_validate(args):
+    from validate_catalog import validate_catalog_file
+    return validate_catalog_file(args.json_path)
+
+def cmd_search_index(args):
+    from search_index import build_search_index
+    return build_search_index(args.json_path, args.output) is not None
+
+def cmd_lab_snapshot(args):
+    from lab_snapshot import update_lab_snapshot
+    return update_lab_snapshot(args.path, args.export_dir, args.inat_api, args.gbif_api, args.workers)
+
+def cmd_resolve_taxa(args):
+    from resolve_taxa import resolve_catalog_taxa
+    return resolve_catalog_taxa(args.json_path, args.cache_path, args.inat_api, args.ttl_days * 24 * 3600)
+
+def cmd_rollup_sightings(args):
+    from sightings_rollup import update_rollups
+    return update_rollups(args.source, args.output, args.json_path, args.table)
+
+def cmd_sighting_reports(args):
+    from sightings_report import render_reports
+    return render_reports(args.source, args.output_dir, args.json_path, args.workers)
+
+def cmd_export_excel(args):
+    from export_excel import export_catalog_excel
+    return export_catalog_excel(args.json_path, args.output)
+
+def cmd_scrape_queue(args):
+    import scrape_queue
+    if args.action == "enqueue":
+        return scrape_queue.enqueue(args.queue, args.json_path, args.source)
+    if args.action == "work":
+        return scrape_queue.work(args.queue, args.processes, args.lease, args.max_attempts)
+    if args.action == "merge":
+        return scrape_queue.merge(args.queue, args.json_path)
+    return scrape_queue.show_status(args.queue)
+
+def build_parser():
+    """
+    Build the argument parser with one subcommand per pipeline stage
+    """
+    parser = argparse.ArgumentParser(prog="pipeline.py", description="Bird data pipeline")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("update-excel", help="Update image URLs from the merged source workbooks")
+    p.add_argument("--assets-dir", default="attached_assets")
+    p.add_argument("--json-path", default=JSON_PATH)
+    p.add_argument("--merged", default="merged_source.json")
+    p.set_defaults(func=cmd_update_excel, writes_catalog=True)
+
+    p = subparsers.add_parser("check-excel", help="Show the columns of an Excel file (default: the newest workbook)")
+    p.add_argument("excel_path", nargs="?", default=None)
+    p.set_defaults(func=cmd_check_excel)
+
+    p = subparsers.add_parser("scrape-wikiaves", help="Fetch image URLs from the WikiAves links of the merged workbooks")
+    p.add_argument("--assets-dir", default="attached_assets")
+    p.add_argument("--json-path", default=JSON_PATH)
+    p.add_argument("--merged", default="merged_source.json")
+    p.set_defaults(func=cmd_scrape_wikiaves, writes_catalog=True)
+
+    p = subparsers.add_parser("scrape-wiki-images", help="Fetch image URLs from Wikipedia")
+    p.add_argument("--json-path", default=JSON_PATH)
+    p.set_defaults(func=cmd_scrape_wiki_images, writes_catalog=True)
+
+    p = subparsers.add_parser("fix-image-urls", help="Convert Special:FilePath URLs to direct URLs")
+    p.add_argument("--json-path", default=JSON_PATH)
+    p.set_defaults(func=cmd_fix_image_urls, writes_catalog=True)
+
+    p = subparsers.add_parser("fix-problem-birds", help="Apply hardcoded URLs for problem birds")
+    p.set_defaults(func=cmd_fix_problem_birds, writes_catalog=True)
+
+    p = subparsers.add_parser("merge", help="Merge all source workbooks into one table")
+    p.add_argument("--assets-dir", default="attached_assets")
+    p.add_argument("--output", default="merged_source.json")
+    p.add_argument("--workers", type=int, default=None)
+    p.set_defaults(func=cmd_merge)
+
+    p = subparsers.add_parser("watch", help="Rebuild bird_data.json when the workbooks change")
+    p.add_argument("--assets-dir", default="attached_assets")
+    p.add_argument("--json-path", default=JSON_PATH)
+    p.add_argument("--debounce", type=float, default=0.5)
+    p.set_defaults(func=cmd_watch)
+
+    p = subparsers.add_parser("validate", help="Check bird_data.json against the schema")
+    p.add_argument("--json-path", default=JSON_PATH)
+    p.set_defaults(func=cmd_validate)
+
+    p = subparsers.add_parser("search-index", help="Build the full-text search index")
+    p.add_argument("--json-path", default=JSON_PATH)
+    p.add_argument("--output", default=None)
+    p.set_defaults(func=cmd_search_index)
+
+    p = subparsers.add_parser("lab-snapshot", help="Update the offline iNaturalist/GBIF snapshot")
+    p.add_argument("--path", default="lab_snapshot.sqlite")
+    p.add_argument("--export-dir", default="lab_snapshot")
+    p.add_argument("--inat-api", default="https://api.inaturalist.org/v1")
+    p.add_argument("--gbif-api", default="https://api.gbif.org/v1")
+    p.add_argument("--workers", type=int, default=4)
+    p.set_defaults(func=cmd_lab_snapshot)
+
+    p = subparsers.add_parser("resolve-taxa", help="Store the iNaturalist taxon of every bird")
+    p.add_argument("--json-path", default=JSON_PATH)
+    p.add_argument("--cache-path", default="inat_taxa_cache.json")
+    p.add_argument("--inat-api", default="https://api.inaturalist.org/v1")
+    p.add_argument("--ttl-days", type=float, default=30)
+    p.set_defaults(func=cmd_resolve_taxa)
+
+    p = subparsers.add_parser("rollup-sightings", help="Update the precomputed sightings statistics")
+    p.add_argument("source", help="SQLite export of the sighting records")
+    p.add_argument("--output", default="sightings_rollup.sqlite")
+    p.add_argument("--json-path", default=JSON_PATH)
+    p.add_argument("--table", default="sighting_records")
+    p.set_defaults(func=cmd_rollup_sightings)
+
+    p = subparsers.add_parser("sighting-reports", help="Render a sightings PDF for every visitor")
+    p.add_argument("source", help="SQLite export of the bird_sightings table")
+    p.add_argument("--output-dir", default="sighting_reports")
+    p.add_argument("--json-path", default=JSON_PATH)
+    p.add_argument("--workers", type=int, default=None)
+    p.set_defaults(func=cmd_sighting_reports)
+
+    p = subparsers.add_parser("export-excel", help="Export bird_data.json to a workbook for editors")
+    p.add_argument("--json-path", default=JSON_PATH)
+    p.add_argument("--output", default="bird_data_export.xlsx")
+    p.set_defaults(func=cmd_export_excel)
+
+    p = subparsers.add_parser("scrape-queue", help="Scrape images through a shared work queue")
+    p.add_argument("action", choices=["enqueue", "work", "merge", "status"])
+    p.add_argument("--queue", default="scrape_queue.sqlite")
+    p.add_argument("--json-path", default=JSON_PATH)
+    p.add_argument("--source", choices=["wikipedia", "wikiaves"], default="wikipedia")
+    p.add_argument("--processes", type=int, default=1)
+    p.add_argument("--lease", type=float, default=300)
+    p.add_argument("--max-attempts", type=int, default=3)
+    p.set_defaults(func=cmd_scrape_queue)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    result = args.func(args)
+    # Commands that report success return a bool; the others return None
+    if result is False:
+        return 1
+    if getattr(args, "writes_catalog", False):
+        from validate_catalog import validate_catalog_file
+        if not validate_catalog_file(getattr(args, "json_path", JSON_PATH)):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
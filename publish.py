@@ -0,0 +1,49 @@
+import json
+import os
+import stat
+import tempfile
+
+from bird_record import to_json
+from validate_catalog import check_catalog
+
+def _file_mode(path):
+    """
+    Get the permissions of the file at `path`, or those a new file would get
+    """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def publish_json(data, json_path):
+    """
+    Atomically replace the JSON file at `json_path` with `data`
+
+    The data is written to a temporary file in the same directory and then
+    renamed over the target, so readers never see a half-written file. The
+    target keeps its permissions, so the server can still read it.
+    """
+    directory = os.path.dirname(os.path.abspath(json_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2, default=to_json)
+        # mkstemp creates the file readable by its owner only
+        os.chmod(tmp_path, _file_mode(json_path))
+        os.replace(tmp_path, json_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def publish_catalog(birds, json_path):
+    """
+    Validate the catalog and atomically publish it to `json_path`
+
+    Raises CatalogValidationError, leaving the published file untouched, if
+    any bird breaks the schema.
+    """
+    check_catalog(birds)
+    publish_json(birds, json_path)
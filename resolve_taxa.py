@@ -0,0 +1,171 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bird_record import TAXON_FIELDS, load_birds
+from lazy_import import ensure_loaded, lazy_import
+from publish import publish_catalog, publish_json
+
+requests = lazy_import('requests')
+
+INAT_API = "https://api.inaturalist.org/v1"
+JSON_PATH = "bird_data.json"
+CACHE_PATH = "inat_taxa_cache.json"
+
+# Cached lookups, including misses, are trusted for this long
+CACHE_TTL = 30 * 24 * 3600
+
+# Same pacing as /api/lab/inat-catalog-taxa: batches of 5 lookups, 200 ms apart
+WORKERS = 5
+BATCH_DELAY = 0.2
+
+def _cache_key(name):
+    return " ".join(name.split()).lower()
+
+def load_cache(cache_path=CACHE_PATH):
+    """
+    Load the name -> taxon cache, or an empty one if it doesn't exist yet
+    """
+    if not os.path.exists(cache_path):
+        return {}
+    with open(cache_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def pick_taxon(name, results):
+    """
+    Pick the species matching `name` exactly, or whose matched synonym is `name`
+    """
+    name_low = name.lower()
+    for taxon in results:
+        if taxon.get("rank") != "species":
+            continue
+        if taxon.get("name", "").lower() == name_low or (taxon.get("matched_term") or "").lower() == name_low:
+            return taxon
+    return None
+
+def lookup_taxon(name, api=INAT_API):
+    """
+    Search iNaturalist for a scientific name, returning the matching taxon or None
+    """
+    response = requests.get(
+        f"{api}/taxa",
+        params={"q": name, "per_page": 5, "is_active": "true"},
+        headers={'User-Agent': 'tocabirds-taxa-resolver'},
+        timeout=30,
+    )
+    response.raise_for_status()
+    return pick_taxon(name, response.json().get("results", []))
+
+def _cache_entry(name, taxon, now):
+    if taxon is None:
+        return {"taxon": None, "fetchedAt": now}
+    return {
+        "taxon": {
+            "id": taxon["id"],
+            "name": taxon["name"],
+            "preferred_common_name": taxon.get("preferred_common_name"),
+            "photo_url": (taxon.get("default_photo") or {}).get("square_url"),
+            "observations_count": taxon.get("observations_count"),
+        },
+        "fetchedAt": now,
+        # Set when iNat resolved our name as a synonym of another accepted name
+        "synonymOf": taxon["name"] if taxon["name"].lower() != name.lower() else None,
+    }
+
+def resolve_names(names, cache, api=INAT_API, ttl=CACHE_TTL, now=None, workers=WORKERS, delay=BATCH_DELAY):
+    """
+    Resolve scientific names to taxa, only querying names missing from or stale in the cache
+
+    Names are looked up in batches of `workers`, waiting `delay` seconds
+    between batches. Returns the number of names fetched. Failed lookups are
+    left out of the cache so they are retried on the next run.
+    """
+    now = time.time() if now is None else now
+    stale = sorted({
+        name for name in names
+        if now - cache.get(_cache_key(name), {}).get("fetchedAt", float("-inf")) > ttl
+    })
+
+    def fetch(name):
+        try:
+            return name, lookup_taxon(name, api), None
+        except Exception as e:
+            return name, None, e
+
+    # Loading requests from several threads at once is not safe, so do it here
+    ensure_loaded(requests)
+
+    fetched = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(stale), workers):
+            if start:
+                time.sleep(delay)
+            for name, taxon, error in pool.map(fetch, stale[start:start + workers]):
+                if error is not None:
+                    print(f"Error resolving {name}: {error}")
+                    continue
+                entry = _cache_entry(name, taxon, now)
+                cache[_cache_key(name)] = entry
+                # Also cache the accepted name, so renaming a bird to it needs no lookup
+                if entry.get("synonymOf"):
+                    accepted = {**entry, "synonymOf": None}
+                    cache.setdefault(_cache_key(entry["synonymOf"]), accepted)
+                fetched += 1
+    return fetched
+
+def taxon_fields(entry):
+    """
+    Convert a cache entry to the inat* fields stored on a bird record
+    """
+    taxon = (entry or {}).get("taxon")
+    if taxon is None:
+        return dict.fromkeys(TAXON_FIELDS)
+    return {
+        "inatTaxonId": taxon["id"],
+        "inatTaxonName": taxon["name"],
+        "inatCommonName": taxon.get("preferred_common_name"),
+        "inatPhotoUrl": taxon.get("photo_url"),
+        "inatObservationsCount": taxon.get("observations_count"),
+    }
+
+def resolve_catalog_taxa(json_path=JSON_PATH, cache_path=CACHE_PATH, api=INAT_API, ttl=CACHE_TTL):
+    """
+    Store the iNaturalist taxon of every bird on its bird_data.json record
+    """
+    print("Resolving iNaturalist taxa for the catalog...")
+    try:
+        bird_data = load_birds(json_path)
+        cache = load_cache(cache_path)
+
+        names = [bird['scientificName'] for bird in bird_data if bird.get('scientificName')]
+        fetched = resolve_names(names, cache, api, ttl)
+        print(f"Looked up {fetched} of {len(set(names))} names on iNaturalist")
+        publish_json(cache, cache_path)
+
+        update_count = 0
+        for bird in bird_data:
+            if not bird.get('scientificName'):
+                continue
+            entry = cache.get(_cache_key(bird['scientificName']))
+            if entry is None:
+                # Lookup failed; keep whatever the record already had
+                continue
+            fields = taxon_fields(entry)
+            if any(k not in bird or bird[k] != v for k, v in fields.items()):
+                bird.update(fields)
+                update_count += 1
+                if entry.get("synonymOf"):
+                    print(f"{bird['scientificName']} is a synonym of {entry['synonymOf']}")
+
+        if update_count:
+            publish_catalog(bird_data, json_path)
+        print(f"Updated taxa for {update_count} birds in {json_path}")
+        return True
+
+    except Exception as e:
+        print(f"Error resolving taxa: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    resolve_catalog_taxa()
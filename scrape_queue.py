@@ -0,0 +1,311 @@
+import os
+import random
+import socket
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bird_record import load_birds
+from publish import publish_catalog
+from scrape_wiki_images import DIRECT_URLS, filepath_fallback_url, get_wikipedia_image_url
+from scrape_wikiaves import get_wikiaves_image_url
+
+JSON_PATH = "bird_data.json"
+QUEUE_PATH = "scrape_queue.sqlite"
+
+# Image lookups per source, and the catalog field holding the page to scrape
+FETCHERS = {
+    "wikipedia": get_wikipedia_image_url,
+    "wikiaves": get_wikiaves_image_url,
+}
+URL_FIELDS = {
+    "wikipedia": "wikipediaUrl",
+    "wikiaves": "wikiavesUrl",
+}
+
+# Seconds each worker waits between requests, as update_bird_data_from_wikiaves does
+# (get_wikipedia_image_url already sleeps on its own)
+DELAYS = {"wikiaves": (1, 3)}
+
+LEASE_SECONDS = 300
+MAX_ATTEMPTS = 3
+
+# Jobs are leased until `lease_expires`; a job whose worker died becomes
+# claimable again once its lease runs out
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    source TEXT NOT NULL,
+    name TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL,
+    PRIMARY KEY (source, name)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_expires);
+"""
+
+def open_queue(path=QUEUE_PATH):
+    """
+    Open the queue database, creating its tables if needed
+
+    The default rollback journal is kept instead of WAL, since WAL does not
+    work when workers on other machines share the file over a network mount.
+    """
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.executescript(SCHEMA)
+    return conn
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def enqueue_catalog(conn, birds, source="wikipedia"):
+    """
+    Add one job per bird that has a page for `source`, returning the number added
+
+    Birds already queued for the source are left alone, so re-running this
+    never resets their progress. As in fix_bird_data_json, birds with a
+    predefined URL or a direct Wikimedia image are skipped for Wikipedia.
+    """
+    field = URL_FIELDS[source]
+    rows = []
+    for bird in birds:
+        url = bird.get(field)
+        if not url:
+            continue
+        if source == "wikipedia" and (bird.name in DIRECT_URLS
+                                      or 'upload.wikimedia.org' in (bird.get('imageUrl') or '')):
+            continue
+        rows.append((source, bird.name, url, time.time()))
+    before = conn.total_changes
+    conn.executemany("INSERT OR IGNORE INTO jobs (source, name, url, updated_at) VALUES (?,?,?,?)", rows)
+    return conn.total_changes - before
+
+def claim_job(conn, worker_id, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS, now=None):
+    """
+    Lease the next pending or expired job to `worker_id`, returning (source, name, url, attempts) or None
+    """
+    now = time.time() if now is None else now
+    # BEGIN IMMEDIATE takes the write lock up front, so two workers can't claim the same job
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Jobs whose last allowed attempt died with its worker won't be retried
+        conn.execute("""
+            UPDATE jobs SET status = 'failed', error = 'lease expired', lease_owner = NULL, updated_at = ?
+            WHERE status = 'leased' AND lease_expires <= ? AND attempts >= ?
+        """, (now, now, max_attempts))
+        row = conn.execute("""
+            SELECT source, name, url, attempts FROM jobs
+            WHERE attempts < ? AND (status = 'pending' OR (status = 'leased' AND lease_expires <= ?))
+            ORDER BY attempts, updated_at LIMIT 1
+        """, (max_attempts, now)).fetchone()
+        if row is not None:
+            conn.execute("""
+                UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?,
+                    lease_expires = ?, updated_at = ?
+                WHERE source = ? AND name = ?
+            """, (worker_id, now + lease_seconds, now, row[0], row[1]))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    if row is None:
+        return None
+    source, name, url, attempts = row
+    return source, name, url, attempts + 1
+
+def complete_job(conn, job, worker_id, result, now=None):
+    """
+    Record the result of a leased job, returning False if the lease was lost meanwhile
+    """
+    now = time.time() if now is None else now
+    cursor = conn.execute("""
+        UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_owner = NULL,
+            lease_expires = NULL, updated_at = ?
+        WHERE source = ? AND name = ? AND status = 'leased' AND lease_owner = ?
+    """, (result, now, job[0], job[1], worker_id))
+    return cursor.rowcount == 1
+
+def fail_job(conn, job, worker_id, error, max_attempts=MAX_ATTEMPTS, now=None):
+    """
+    Record a failed attempt; the job is retried until it has used `max_attempts`
+    """
+    now = time.time() if now is None else now
+    status = "failed" if job[3] >= max_attempts else "pending"
+    cursor = conn.execute("""
+        UPDATE jobs SET status = ?, error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ?
+        WHERE source = ? AND name = ? AND status = 'leased' AND lease_owner = ?
+    """, (status, error, now, job[0], job[1], worker_id))
+    return cursor.rowcount == 1
+
+def run_worker(queue_path=QUEUE_PATH, worker_id=None, lease_seconds=LEASE_SECONDS,
+               max_attempts=MAX_ATTEMPTS, fetchers=None, delays=None):
+    """
+    Claim and run jobs until none are left to claim, returning the number of jobs run
+    """
+    worker_id = worker_id or default_worker_id()
+    fetchers = FETCHERS if fetchers is None else fetchers
+    delays = DELAYS if delays is None else delays
+    conn = open_queue(queue_path)
+    count = 0
+    try:
+        while True:
+            job = claim_job(conn, worker_id, lease_seconds, max_attempts)
+            if job is None:
+                return count
+            source, name, url, attempts = job
+            try:
+                result = fetchers[source](url)
+            except Exception as e:
+                result, error = None, str(e)
+            else:
+                # The scrapers report both errors and pages without an image as None
+                error = None if result else "no image found"
+
+            if error is None:
+                stored = complete_job(conn, job, worker_id, result)
+            else:
+                stored = fail_job(conn, job, worker_id, error, max_attempts)
+                print(f"[{worker_id}] {name} ({source}), attempt {attempts}: {error}")
+            if not stored:
+                print(f"[{worker_id}] Lease on {name} ({source}) expired; result discarded")
+            count += 1
+
+            if source in delays:
+                time.sleep(random.uniform(*delays[source]))
+    finally:
+        conn.close()
+
+def run_workers(queue_path=QUEUE_PATH, processes=4, lease_seconds=LEASE_SECONDS,
+                max_attempts=MAX_ATTEMPTS, fetchers=None, delays=None):
+    """
+    Run `processes` workers on this machine, returning the total number of jobs run
+    """
+    base = default_worker_id()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [
+            pool.submit(run_worker, queue_path, f"{base}-{i}", lease_seconds, max_attempts, fetchers, delays)
+            for i in range(processes)
+        ]
+        return sum(f.result() for f in futures)
+
+def queue_status(conn):
+    """
+    Count the jobs of each source by status
+    """
+    status = {}
+    for source, state, count in conn.execute(
+            "SELECT source, status, COUNT(*) FROM jobs GROUP BY source, status ORDER BY source, status"):
+        status.setdefault(source, {})[state] = count
+    return status
+
+def merge_results(conn, birds):
+    """
+    Apply the image URL of every finished job to its bird, returning the number of birds updated
+
+    When several sources found an image for a bird, the most recent result
+    wins. As in fix_bird_data_json, a Special:FilePath image whose Wikipedia
+    lookup failed is converted to a direct URL, and the predefined
+    DIRECT_URLS are applied last.
+    """
+    by_name = {bird.name: bird for bird in birds}
+    updated = set()
+
+    def apply(bird, url):
+        if bird is not None and url and bird.get('imageUrl') != url:
+            bird.imageUrl = url
+            updated.add(bird.name)
+
+    for name, result in conn.execute(
+            "SELECT name, result FROM jobs WHERE status = 'done' AND result IS NOT NULL ORDER BY updated_at"):
+        apply(by_name.get(name), result)
+    for (name,) in conn.execute("SELECT name FROM jobs WHERE source = 'wikipedia' AND status = 'failed'"):
+        bird = by_name.get(name)
+        if bird is not None:
+            apply(bird, filepath_fallback_url(bird.get('imageUrl')))
+    for name, url in DIRECT_URLS.items():
+        apply(by_name.get(name), url)
+    return len(updated)
+
+def enqueue(queue_path=QUEUE_PATH, json_path=JSON_PATH, source="wikipedia"):
+    """
+    Queue one scraping job per species of the catalog
+    """
+    try:
+        birds = load_birds(json_path)
+        conn = open_queue(queue_path)
+        try:
+            added = enqueue_catalog(conn, birds, source)
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Error queueing jobs: {str(e)}")
+        return False
+    print(f"Queued {added} {source} jobs in {queue_path}")
+    return True
+
+def work(queue_path=QUEUE_PATH, processes=1, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+    """
+    Work through the queue with one or more local worker processes
+    """
+    try:
+        if processes <= 1:
+            count = run_worker(queue_path, lease_seconds=lease_seconds, max_attempts=max_attempts)
+        else:
+            count = run_workers(queue_path, processes, lease_seconds, max_attempts)
+    except Exception as e:
+        print(f"Error running workers: {str(e)}")
+        return False
+    print(f"Ran {count} jobs from {queue_path}")
+    return True
+
+def show_status(queue_path=QUEUE_PATH):
+    """
+    Print the job counts of the queue
+    """
+    try:
+        conn = open_queue(queue_path)
+        try:
+            status = queue_status(conn)
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"Error reading {queue_path}: {str(e)}")
+        return False
+    for source, counts in status.items():
+        print(f"{source}: " + ", ".join(f"{count} {state}" for state, count in counts.items()))
+    return True
+
+def merge(queue_path=QUEUE_PATH, json_path=JSON_PATH):
+    """
+    Write the results of the finished jobs to the bird data JSON file
+    """
+    try:
+        birds = load_birds(json_path)
+        conn = open_queue(queue_path)
+        try:
+            update_count = merge_results(conn, birds)
+            status = queue_status(conn)
+        finally:
+            conn.close()
+        if update_count:
+            publish_catalog(birds, json_path)
+    except Exception as e:
+        print(f"Error merging results: {str(e)}")
+        return False
+
+    for source, counts in status.items():
+        unfinished = sum(c for state, c in counts.items() if state != "done")
+        if unfinished:
+            print(f"Warning: {unfinished} {source} jobs are not done yet")
+    print(f"Updated {update_count} birds in {json_path}")
+    return True
+
+if __name__ == "__main__":
+    import sys
+    action = sys.argv[1] if len(sys.argv) > 1 else "status"
+    {"enqueue": enqueue, "work": work, "merge": merge, "status": show_status}[action]()
@@ -1,8 +1,13 @@
-import requests
-from bs4 import BeautifulSoup
-import json
 import time
 
+from bird_record import load_birds
+from lazy_import import lazy_import
+from publish import publish_catalog
+
+# Heavy dependencies are only loaded once a page is actually fetched
+requests = lazy_import('requests')
+bs4 = lazy_import('bs4')
+
 # Define direct image URLs for birds with known issues
 DIRECT_URLS = {
     "Saíra-sete-cores": "https://upload.wikimedia.org/wikipedia/commons/4/4b/Tangara_seledon_Itamambuca_Eco_Resort.jpg",
@@ -31,7 +36,7 @@ def get_wikipedia_image_url(wiki_url):
         response.raise_for_status()
         
         # Parse the HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = bs4.BeautifulSoup(response.text, 'html.parser')
         
         # Find the image in the infobox
         infobox = soup.find('table', class_='infobox')
@@ -49,7 +54,7 @@ def get_wikipedia_image_url(wiki_url):
                         file_page_url = 'https://pt.wikipedia.org' + file_link['href']
                         # Request the file page
                         file_response = requests.get(file_page_url, headers={'User-Agent': 'Mozilla/5.0'})
-                        file_soup = BeautifulSoup(file_response.text, 'html.parser')
+                        file_soup = bs4.BeautifulSoup(file_response.text, 'html.parser')
                         # Find the original file link
                         original_file = file_soup.find('div', class_='fullImageLink')
                         if original_file and original_file.find('a'):
@@ -85,46 +90,53 @@ def get_wikipedia_image_url(wiki_url):
         print(f"Error getting image from {wiki_url}: {e}")
         return None
 
+def filepath_fallback_url(image_url):
+    """
+    Convert a Special:FilePath image URL to a direct upload.wikimedia.org URL, or return None
+    """
+    if 'Special:FilePath' not in (image_url or ''):
+        return None
+    filename = image_url.split('/')[-1]
+    # Use a more reliable direct image URL format
+    return f"https://upload.wikimedia.org/wikipedia/commons/c/c0/{filename}"
+
 def fix_bird_data_json(json_path):
     """
     Fix the image URLs in the bird data JSON file
     """
     try:
         # Read the JSON file
-        with open(json_path, 'r', encoding='utf-8') as f:
-            birds_data = json.load(f)
+        birds_data = load_birds(json_path)
         
         # Process each bird
         for bird in birds_data:
             # If the bird name is in our direct URLs list, use that URL
-            if bird['name'] in DIRECT_URLS:
-                print(f"Using predefined direct URL for {bird['name']}")
-                bird['imageUrl'] = DIRECT_URLS[bird['name']]
+            if bird.name in DIRECT_URLS:
+                print(f"Using predefined direct URL for {bird.name}")
+                bird.imageUrl = DIRECT_URLS[bird.name]
             # Otherwise, attempt to get the image URL from the Wikipedia page
-            elif bird['wikipediaUrl']:
+            elif bird.wikipediaUrl:
                 # Skip if it's already a direct URL to avoid unnecessary requests
-                if 'upload.wikimedia.org' in bird['imageUrl']:
-                    print(f"Skipping {bird['name']} - already has a direct URL")
+                if 'upload.wikimedia.org' in bird.imageUrl:
+                    print(f"Skipping {bird.name} - already has a direct URL")
                     continue
                 
-                print(f"Fetching image for {bird['name']} from {bird['wikipediaUrl']}")
-                direct_image_url = get_wikipedia_image_url(bird['wikipediaUrl'])
+                print(f"Fetching image for {bird.name} from {bird.wikipediaUrl}")
+                direct_image_url = get_wikipedia_image_url(bird.wikipediaUrl)
                 if direct_image_url:
-                    print(f"Found direct image URL for {bird['name']}: {direct_image_url}")
-                    bird['imageUrl'] = direct_image_url
+                    print(f"Found direct image URL for {bird.name}: {direct_image_url}")
+                    bird.imageUrl = direct_image_url
                 else:
-                    print(f"Could not find direct image URL for {bird['name']}")
+                    print(f"Could not find direct image URL for {bird.name}")
                     
                     # Convert the Special:FilePath URL to a direct URL format
-                    if 'Special:FilePath' in bird['imageUrl']:
-                        filename = bird['imageUrl'].split('/')[-1]
-                        # Use a more reliable direct image URL format
-                        bird['imageUrl'] = f"https://upload.wikimedia.org/wikipedia/commons/c/c0/{filename}"
-                        print(f"Converted to direct URL: {bird['imageUrl']}")
+                    fallback_url = filepath_fallback_url(bird.imageUrl)
+                    if fallback_url:
+                        bird.imageUrl = fallback_url
+                        print(f"Converted to direct URL: {bird.imageUrl}")
         
-        # Write the updated data back to the JSON file
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(birds_data, f, ensure_ascii=False, indent=2)
+        # Validate the updated data and atomically replace the JSON file
+        publish_catalog(birds_data, json_path)
         
         print(f"Updated {json_path} with {len(birds_data)} birds")
         return True
@@ -1,11 +1,18 @@
-import pandas as pd
-import json
 import os
-import requests
-from bs4 import BeautifulSoup
 import time
 import random
 
+from bird_record import load_birds
+from lazy_import import lazy_import
+from merge_workbooks import ASSETS_DIR, OUTPUT_PATH, load_merged_source, species_key
+from publish import publish_catalog
+
+JSON_PATH = "bird_data.json"
+
+# Heavy dependencies are only loaded once a page is actually read
+requests = lazy_import('requests')
+bs4 = lazy_import('bs4')
+
 def get_wikiaves_image_url(url):
     """
     Get direct image URL from the WikiAves page
@@ -20,7 +27,7 @@ def get_wikiaves_image_url(url):
             print(f"Failed to fetch {url}, status code: {response.status_code}")
             return None
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = bs4.BeautifulSoup(response.text, 'html.parser')
         
         # First try to find the main photo on the species page
         main_photo = soup.select_one('.contfoto img')
@@ -57,54 +64,42 @@ def get_wikiaves_image_url(url):
         print(f"Error fetching image URL from {url}: {str(e)}")
         return None
 
-def update_bird_data_from_wikiaves():
+def update_bird_data_from_wikiaves(assets_dir=ASSETS_DIR, json_path=JSON_PATH, merged_path=OUTPUT_PATH):
     """
     Update the bird data JSON with image URLs from WikiAves
     """
     print("Starting update of bird data from WikiAves...")
     
-    # Path to the Excel file and JSON file
-    excel_path = "attached_assets/aves_Toca_v2.xlsx"
-    json_path = "bird_data.json"
-    
-    # Check if files exist
-    if not os.path.exists(excel_path):
-        print(f"Error: Excel file not found at {excel_path}")
-        return
-    
     if not os.path.exists(json_path):
         print(f"Error: JSON file not found at {json_path}")
-        return
+        return False
     
     try:
-        # Read the Excel file
-        print(f"Reading Excel file from {excel_path}...")
-        df = pd.read_excel(excel_path)
+        # Newest value per species across every workbook in the assets directory
+        merged = load_merged_source(assets_dir, merged_path)
+        if merged is None:
+            return False
         
         # Load the existing JSON data
         print(f"Reading JSON file from {json_path}...")
-        with open(json_path, 'r', encoding='utf-8') as f:
-            bird_data = json.load(f)
-        
-        # Check available columns
-        print(f"Available columns in Excel: {df.columns.tolist()}")
+        bird_data = load_birds(json_path)
         
-        # Create a dictionary of names to wikiaves URLs from Excel
-        wikiaves_urls = {}
-        for _, row in df.iterrows():
-            name = row.get('Nome Comum', None)
-            if name and 'link' in df.columns and not pd.isna(row['link']):
-                wikiaves_urls[name] = str(row['link'])
+        # Create a dictionary of species to WikiAves links, for the birds in the catalog
+        catalog_keys = {species_key(bird) for bird in bird_data}
+        wikiaves_urls = {
+            record["key"]: (record["name"], record["wikiavesUrl"]) for record in merged
+            if record.get("wikiavesUrl") and record["key"] in catalog_keys
+        }
         
         print(f"Found {len(wikiaves_urls)} birds with WikiAves links")
         
         # Get direct image URLs from WikiAves
         image_urls = {}
-        for name, url in wikiaves_urls.items():
+        for key, (name, url) in wikiaves_urls.items():
             print(f"Fetching image for {name} from {url}...")
             image_url = get_wikiaves_image_url(url)
             if image_url:
-                image_urls[name] = image_url
+                image_urls[key] = image_url
                 print(f"Found image URL: {image_url}")
             else:
                 print(f"No image found for {name}")
@@ -117,25 +112,26 @@ def update_bird_data_from_wikiaves():
         # Update the JSON data with new image URLs
         update_count = 0
         for bird in bird_data:
-            if bird['name'] in image_urls:
+            if species_key(bird) in image_urls:
                 old_url = bird.get('imageUrl', '')
-                new_url = image_urls[bird['name']]
+                new_url = image_urls[species_key(bird)]
                 
                 # Only update if the URL is actually different
                 if old_url != new_url:
-                    bird['imageUrl'] = new_url
+                    bird.imageUrl = new_url
                     update_count += 1
         
         print(f"Updated {update_count} birds with new image URLs")
         
-        # Save the updated JSON data
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(bird_data, f, ensure_ascii=False, indent=2)
+        # Validate the updated data and atomically replace the JSON file
+        publish_catalog(bird_data, json_path)
         
         print(f"Successfully updated JSON file at {json_path}")
+        return True
         
     except Exception as e:
         print(f"Error updating bird data: {str(e)}")
+        return False
 
 if __name__ == "__main__":
     update_bird_data_from_wikiaves()
\ No newline at end of file
@@ -0,0 +1,143 @@
+import json
+import math
+import os
+import re
+import unicodedata
+from collections import Counter
+
+from bird_record import load_birds
+
+JSON_PATH = "bird_data.json"
+INDEX_FILENAME = "bird_search_index.json"
+
+# Free-text fields of the catalog that are searchable
+SEARCH_FIELDS = ["description", "behavior", "habitat", "diet"]
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Common Portuguese words, already accent-folded
+STOP_WORDS = frozenset("""
+a ao aos aquela aquelas aquele aqueles as ate com como da das de dela delas dele
+deles do dos e ela elas ele eles em entre era essa essas esse esses esta estas
+este estes eu foi ha isso isto ja la lhe mais mas me mesmo muito na nas nem no
+nos o os ou para pela pelas pelo pelos pode por qual quando que quem se sem ser
+seu seus so sua suas sao tambem tem um uma umas uns vez
+""".split())
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Plural endings and their singular replacements, checked in order
+PLURAL_SUFFIXES = [
+    ("oes", "ao"), ("aes", "ao"), ("ais", "al"), ("eis", "el"), ("ois", "ol"),
+    ("ns", "m"), ("res", "r"), ("ses", "s"), ("zes", "z"), ("s", ""),
+]
+
+def fold(text):
+    """
+    Lowercase the text and strip its accents, e.g. "Néctar" -> "nectar"
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+def stem(word):
+    """
+    Light Portuguese stemmer: singularize, then drop the final gender vowel
+
+    "matas" and "mata" both become "mat"; "ciliares" becomes "ciliar".
+    """
+    if len(word) < 4:
+        return word
+    for suffix, replacement in PLURAL_SUFFIXES:
+        if word.endswith(suffix) and not word.endswith("ss"):
+            word = word[:-len(suffix)] + replacement
+            break
+    if len(word) > 3 and word[-1] in "aeo":
+        word = word[:-1]
+    return word
+
+def tokenize(text):
+    """
+    Split text into folded, stemmed terms without stop words
+    """
+    if not text:
+        return []
+    return [stem(t) for t in TOKEN_RE.findall(fold(text)) if t not in STOP_WORDS]
+
+def build_index(birds):
+    """
+    Build a BM25 inverted index over the searchable fields of the birds
+
+    Postings map each term to [bird id, score] pairs sorted by score, so a
+    query only needs to sum the precomputed scores of its terms.
+    """
+    lengths = {}
+    term_freqs = {}
+    for bird in birds:
+        terms = []
+        for field in SEARCH_FIELDS:
+            terms.extend(tokenize(bird.get(field)))
+        lengths[bird["id"]] = len(terms)
+        term_freqs[bird["id"]] = Counter(terms)
+
+    doc_count = len(lengths)
+    avg_length = sum(lengths.values()) / doc_count if doc_count else 0.0
+
+    doc_freq = Counter()
+    for counts in term_freqs.values():
+        doc_freq.update(counts.keys())
+
+    postings = {}
+    for bird_id, counts in term_freqs.items():
+        norm = K1 * (1 - B + B * lengths[bird_id] / avg_length) if avg_length else K1
+        for term, tf in counts.items():
+            idf = math.log(1 + (doc_count - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            score = idf * tf * (K1 + 1) / (tf + norm)
+            postings.setdefault(term, []).append([bird_id, round(score, 4)])
+
+    for entries in postings.values():
+        entries.sort(key=lambda e: (-e[1], e[0]))
+
+    return {
+        "version": 1,
+        "fields": SEARCH_FIELDS,
+        "docCount": doc_count,
+        "avgLength": round(avg_length, 4),
+        "postings": dict(sorted(postings.items())),
+    }
+
+def search(index, query, limit=10):
+    """
+    Return (bird id, score) pairs matching any query term, best first
+    """
+    scores = Counter()
+    for term in set(tokenize(query)):
+        for bird_id, score in index["postings"].get(term, []):
+            scores[bird_id] += score
+    return [(bird_id, round(score, 4)) for bird_id, score in scores.most_common(limit)]
+
+def build_search_index(json_path=JSON_PATH, output_path=None):
+    """
+    Build the search index for the bird data JSON file and write it next to it
+    """
+    if output_path is None:
+        output_path = os.path.join(os.path.dirname(json_path), INDEX_FILENAME)
+
+    try:
+        birds = load_birds(json_path)
+    except Exception as e:
+        print(f"Error reading {json_path}: {str(e)}")
+        return None
+
+    index = build_index(birds)
+
+    # Compact separators keep the artifact small enough to ship to the client
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+    print(f"Indexed {index['docCount']} birds ({len(index['postings'])} terms) into {output_path}")
+    return index
+
+if __name__ == "__main__":
+    build_search_index()
@@ -1,12 +1,34 @@
-import type { Express } from "express";
+import type { Express, Response } from "express";
 import { createServer, type Server } from "http";
+import fs from "fs";
+import path from "path";
 import { storage, getSouthernHemisphereSeason } from "./storage";
-import { insertBirdSightingSchema, insertSightingRecordSchema } from "@shared/schema";
+import { insertBirdSightingSchema, insertSightingRecordSchema, type Bird } from "@shared/schema";
 import { z } from "zod";
 import { registerObjectStorageRoutes } from "./replit_integrations/object_storage";
 
 const ADMIN_PASSWORD = process.env.ADMIN_PASSWORD;
 
+// Offline iNaturalist/GBIF snapshot exported by `python pipeline.py lab-snapshot`
+const LAB_SNAPSHOT_DIR = path.resolve("lab_snapshot");
+
+// iNaturalist taxon fields added to bird_data.json records by resolve_taxa.py
+type ResolvedTaxonFields = {
+  inatTaxonId?: number | null;
+  inatTaxonName?: string | null;
+  inatCommonName?: string | null;
+  inatPhotoUrl?: string | null;
+  inatObservationsCount?: number | null;
+};
+
+// Send a snapshot payload if it has been built; returns false to fall back to the live API
+function sendLabSnapshot(res: Response, file: string): boolean {
+  const filePath = path.join(LAB_SNAPSHOT_DIR, file);
+  if (!fs.existsSync(filePath)) return false;
+  res.type("json").sendFile(filePath);
+  return true;
+}
+
 export async function registerRoutes(app: Express): Promise<Server> {
   registerObjectStorageRoutes(app);
   // API endpoint to get all birds
@@ -413,6 +435,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
   // Lab: proxy for iNaturalist observations around Cachoeira da Toca
   // Lab: individual observations (for map coordinates + season filtering)
   app.get("/api/lab/inat", async (_req, res) => {
+    if (sendLabSnapshot(res, "inat.json")) return;
     try {
       const url = 'https://api.inaturalist.org/v1/observations' +
         '?taxon_name=Aves&lat=-23.862969&lng=-45.321893&radius=17&per_page=200';
@@ -426,6 +449,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
 
   // Lab: full unique-species list via species_counts (matches iNat website species tab)
   app.get("/api/lab/inat-species", async (_req, res) => {
+    if (sendLabSnapshot(res, "inat-species.json")) return;
     try {
       const url = 'https://api.inaturalist.org/v1/observations/species_counts' +
         '?iconic_taxa[]=Aves&lat=-23.862969&lng=-45.321893&radius=17&per_page=500';
@@ -442,13 +466,31 @@ export async function registerRoutes(app: Express): Promise<Server> {
   app.get("/api/lab/inat-catalog-taxa", async (_req, res) => {
     try {
       const birds = await storage.getBirds();
-      const names = [...new Set(birds.map(b => b.scientificName).filter(Boolean))];
 
       const result: Record<string, {
         id: number; name: string; preferred_common_name?: string;
         default_photo?: { square_url: string }; observations_count?: number;
       }> = {};
 
+      // Taxa already resolved by `python pipeline.py resolve-taxa` are stored on the
+      // bird records (inatTaxonId is null when iNat had no match); only the rest are looked up
+      const unresolved = new Set<string>();
+      for (const b of birds as (Bird & ResolvedTaxonFields)[]) {
+        if (!b.scientificName) continue;
+        if (b.inatTaxonId === undefined) {
+          unresolved.add(b.scientificName);
+        } else if (b.inatTaxonId !== null) {
+          result[b.scientificName.toLowerCase()] = {
+            id: b.inatTaxonId,
+            name: b.inatTaxonName ?? b.scientificName,
+            preferred_common_name: b.inatCommonName ?? undefined,
+            default_photo: b.inatPhotoUrl ? { square_url: b.inatPhotoUrl } : undefined,
+            observations_count: b.inatObservationsCount ?? undefined,
+          };
+        }
+      }
+      const names = [...unresolved];
+
       // Parallel in batches of 5 with a small delay to respect iNat rate limits
       const BATCH = 5;
       const delay = (ms: number) => new Promise(r => setTimeout(r, ms));
@@ -489,6 +531,7 @@ export async function registerRoutes(app: Express): Promise<Server> {
 
   // Lab: proxy for eBird/GBIF occurrences around Ilhabela
   app.get("/api/lab/gbif", async (_req, res) => {
+    if (sendLabSnapshot(res, "gbif.json")) return;
     try {
       const url = 'https://api.gbif.org/v1/occurrence/search' +
         '?datasetKey=4fa7b334-ce0d-4e88-aaae-2e0c138d049e' +
@@ -0,0 +1,260 @@
+import hashlib
+import html
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+from string import Template
+from urllib.parse import urlparse
+from urllib.request import pathname2url
+
+from bird_record import load_birds
+from lazy_import import ensure_loaded, lazy_import
+
+requests = lazy_import('requests')
+
+JSON_PATH = "bird_data.json"
+OUTPUT_DIR = "sighting_reports"
+IMAGE_CACHE_DIR = os.path.join("report_cache", "images")
+# Local images such as /birds/bird-1.jpg are served from here
+PUBLIC_DIR = os.path.join("client", "public")
+SOURCE_TABLE = "bird_sightings"
+
+# Same palette as client/src/lib/pdfGenerator.ts
+GREEN = "#0f783a"
+GREEN_LIGHT = "#e8f5ee"
+GREEN_BORDER = "#a8d5b8"
+GRAY_TEXT = "#555"
+
+MONTHS_PT = [
+    "janeiro", "fevereiro", "março", "abril", "maio", "junho",
+    "julho", "agosto", "setembro", "outubro", "novembro", "dezembro",
+]
+
+# wkhtmltopdf options; local file access is needed for the cached images
+PDF_OPTIONS = {
+    "page-size": "A4",
+    "encoding": "UTF-8",
+    "margin-top": "0",
+    "margin-bottom": "0",
+    "margin-left": "0",
+    "margin-right": "0",
+    "enable-local-file-access": None,
+    "quiet": None,
+}
+
+# The header sits in <thead>, so wkhtmltopdf repeats it on every page, and
+# rows never break across pages, like the page splitting of the browser version.
+REPORT_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="pt-BR"><head><meta charset="utf-8"><style>
+body { margin: 0; font-family: Arial, sans-serif; background: white; }
+table.report { width: 100%; border-collapse: separate; border-spacing: 16px; }
+thead { display: table-header-group; }
+tr { page-break-inside: avoid; }
+td.card-cell { width: 50%; vertical-align: top; }
+.header { border-bottom: 3px solid $green; padding: 28px 20px 22px; }
+.header h1 { font-size: 26px; margin: 0 0 6px; color: $green; letter-spacing: 0.5px; }
+.header p { margin: 0; font-size: 13px; color: $gray; }
+.card { border: 1px solid $green_border; border-radius: 10px; overflow: hidden; }
+.card table { border-collapse: collapse; width: 100%; }
+.card .image { width: 130px; height: 130px; background: $green_light; vertical-align: top; padding: 0; }
+.card .image img { width: 130px; height: 130px; object-fit: cover; display: block; }
+.card .info { padding: 12px 14px; vertical-align: top; }
+.card h2 { margin: 0 0 2px; font-size: 15px; color: #222; }
+.card .sci { margin: 0 0 6px; font-size: 12px; font-style: italic; color: #888; }
+.card .desc, .card .value { font-size: 10px; color: $gray; line-height: 1.5; }
+.card .desc { margin: 0 0 4px; }
+.card .section { margin-bottom: 4px; }
+.card .label { font-weight: bold; font-size: 10px; color: $green; }
+.footer { border-top: 2px solid $green_border; margin: 0 24px; padding: 12px 0;
+          text-align: center; font-size: 11px; color: #aaa; }
+</style></head><body>
+<table class="report">
+<thead><tr><td colspan="2"><div class="header">
+<h1>As aves que vi na Cachoeira da Toca!</h1>
+<p>Projeto Despertar para a Observação de Aves · $subtitle</p>
+</div></td></tr></thead>
+<tbody>
+$rows
+</tbody>
+</table>
+<div class="footer">Cachoeira da Toca · tocabirds.com</div>
+</body></html>
+""")
+
+CARD_TEMPLATE = Template("""<div class="card"><table><tr>
+<td class="image">$image</td>
+<td class="info"><h2>$name</h2><p class="sci">$scientific_name</p>$details</td>
+</tr></table></div>""")
+
+SECTION_TEMPLATE = Template(
+    '<div class="section"><span class="label">$label: </span><span class="value">$value</span></div>'
+)
+
+# Bird sections rendered once in the parent and shared with every worker
+_CARDS = {}
+
+def format_date_pt(day):
+    """
+    Format a date like toLocaleDateString('pt-BR', {day: '2-digit', month: 'long', year: 'numeric'})
+    """
+    return f"{day.day:02d} de {MONTHS_PT[day.month - 1]} de {day.year}"
+
+def _image_url(bird):
+    src = bird.get("customImageUrl") or bird.get("imageUrl") or ""
+    return f"https:{src}" if src.startswith("//") else src
+
+def cache_image(url, cache_dir=IMAGE_CACHE_DIR, public_dir=PUBLIC_DIR):
+    """
+    Return a file:// URI for a bird image, downloading remote images once into `cache_dir`
+
+    Returns None when the image can't be found or downloaded; the report then
+    leaves the image box empty, as the browser version does.
+    """
+    if not url:
+        return None
+    if url.startswith("/"):
+        path = os.path.join(public_dir, url.lstrip("/"))
+    else:
+        ext = os.path.splitext(urlparse(url).path)[1].lower() or ".jpg"
+        path = os.path.join(cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ext)
+        if not os.path.exists(path):
+            try:
+                response = requests.get(url, headers={'User-Agent': 'tocabirds-report-renderer'}, timeout=30)
+                response.raise_for_status()
+            except Exception as e:
+                print(f"Error downloading image {url}: {str(e)}")
+                return None
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(response.content)
+    if not os.path.exists(path):
+        return None
+    return "file:" + pathname2url(os.path.abspath(path))
+
+def cache_images(birds, cache_dir=IMAGE_CACHE_DIR, public_dir=PUBLIC_DIR, workers=8):
+    """
+    Resolve the image of every bird concurrently, returning {url: file URI or None}
+    """
+    urls = sorted({_image_url(bird) for bird in birds} - {""})
+    # Loading requests from several threads at once is not safe, so do it here
+    ensure_loaded(requests)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(urls, pool.map(lambda u: cache_image(u, cache_dir, public_dir), urls)))
+
+def render_card(bird, image_src):
+    """
+    Render the report section of one bird
+    """
+    details = ""
+    if bird.get("description"):
+        details += f'<p class="desc">{html.escape(bird["description"])}</p>'
+    for label, field in (("Comportamento", "behavior"), ("Habitat", "habitat"), ("Dieta", "diet")):
+        if bird.get(field):
+            details += SECTION_TEMPLATE.substitute(label=label, value=html.escape(bird[field]))
+    image = f'<img src="{html.escape(image_src)}" alt="{html.escape(bird["name"])}">' if image_src else ""
+    return CARD_TEMPLATE.substitute(
+        image=image,
+        name=html.escape(bird["name"]),
+        scientific_name=html.escape(bird.get("scientificName") or ""),
+        details=details,
+    )
+
+def render_cards(birds, images):
+    """
+    Render every catalog bird once, keyed by bird id
+    """
+    return {bird["id"]: render_card(bird, images.get(_image_url(bird))) for bird in birds}
+
+def render_report_html(cards, bird_ids, generated_on=None):
+    """
+    Assemble a visitor's report from the pre-rendered bird sections
+    """
+    generated_on = generated_on or date.today()
+    sections = [cards[bird_id] for bird_id in bird_ids if bird_id in cards]
+    rows = []
+    for i in range(0, len(sections), 2):
+        pair = sections[i:i + 2]
+        rows.append("<tr>" + "".join(f'<td class="card-cell">{s}</td>' for s in pair)
+                    + ('<td class="card-cell"></td>' if len(pair) == 1 else "") + "</tr>")
+    count = len(sections)
+    noun = "espécie registrada" if count == 1 else "espécies registradas"
+    return REPORT_TEMPLATE.substitute(
+        green=GREEN, green_light=GREEN_LIGHT, green_border=GREEN_BORDER, gray=GRAY_TEXT,
+        subtitle=f"{count} {noun} · {format_date_pt(generated_on)}",
+        rows="\n".join(rows),
+    )
+
+def html_to_pdf(report_html, output_path):
+    """
+    Convert report HTML to a PDF file with wkhtmltopdf
+    """
+    import pdfkit
+    pdfkit.from_string(report_html, output_path, options=PDF_OPTIONS)
+
+def _init_worker(cards):
+    global _CARDS
+    _CARDS = cards
+
+def _render_job(job):
+    visitor, bird_ids, output_path, generated_on = job
+    try:
+        html_to_pdf(render_report_html(_CARDS, bird_ids, generated_on), output_path)
+        return visitor, output_path, None
+    except Exception as e:
+        return visitor, output_path, str(e)
+
+def load_visitor_birds(source_path, table=SOURCE_TABLE):
+    """
+    Read each visitor's seen birds from a SQLite export of bird_sightings, in the order they were marked
+    """
+    conn = sqlite3.connect(source_path)
+    try:
+        visitors = {}
+        for user_id, bird_id in conn.execute(f"SELECT user_id, bird_id FROM {table} ORDER BY user_id, id"):
+            birds = visitors.setdefault(user_id, [])
+            if bird_id not in birds:
+                birds.append(bird_id)
+        return visitors
+    finally:
+        conn.close()
+
+def render_reports(source_path, output_dir=OUTPUT_DIR, json_path=JSON_PATH, workers=None,
+                   cache_dir=IMAGE_CACHE_DIR, public_dir=PUBLIC_DIR, generated_on=None):
+    """
+    Render a sightings PDF for every visitor in the export on a process pool
+    """
+    print(f"Rendering sighting reports from {source_path}...")
+    try:
+        birds = load_birds(json_path)
+        visitors = load_visitor_birds(source_path)
+    except Exception as e:
+        print(f"Error reading sightings: {str(e)}")
+        return False
+
+    cards = render_cards(birds, cache_images(birds, cache_dir, public_dir))
+    os.makedirs(output_dir, exist_ok=True)
+    generated_on = generated_on or date.today()
+    jobs = [
+        (visitor, bird_ids, os.path.join(output_dir, f"aves-vistas-{visitor}.pdf"), generated_on)
+        for visitor, bird_ids in visitors.items()
+    ]
+
+    if workers == 1 or len(jobs) <= 1:
+        _init_worker(cards)
+        results = [_render_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cards,)) as pool:
+            results = list(pool.map(_render_job, jobs))
+
+    failed = 0
+    for visitor, output_path, error in results:
+        if error is not None:
+            failed += 1
+            print(f"Error rendering report for visitor {visitor}: {error}")
+    print(f"Rendered {len(results) - failed} of {len(results)} reports into {output_dir}")
+    return failed == 0
+
+if __name__ == "__main__":
+    import sys
+    render_reports(sys.argv[1] if len(sys.argv) > 1 else "sightings_export.sqlite")
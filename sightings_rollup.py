@@ -0,0 +1,377 @@
+import sqlite3
+from datetime import date, timedelta
+
+from bird_record import load_birds
+from lazy_import import lazy_import
+
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+JSON_PATH = "bird_data.json"
+ROLLUP_PATH = "sightings_rollup.sqlite"
+SOURCE_TABLE = "sighting_records"
+
+# Cachoeira da Toca – Ilhabela, SP, Brazil (same as server/storage.ts)
+TOCA_LAT = -23.78
+TOCA_LON = -45.36
+GEO_RADIUS_KM = 10
+
+PERIOD_DAYS = {"last1month": 30, "last3months": 90, "last6months": 180, "last1year": 365}
+
+# Materialized tables use these values for "no filter"
+ALL_SEASONS = ""
+ALL_YEARS = 0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollup_state (
+    source TEXT PRIMARY KEY,
+    last_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rollup_daily (
+    day TEXT NOT NULL,
+    bird_id INTEGER NOT NULL,
+    bird_name TEXT NOT NULL,
+    season TEXT NOT NULL,
+    geo INTEGER NOT NULL,
+    first_id INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, bird_id, bird_name, season, geo)
+);
+CREATE TABLE IF NOT EXISTS sightings_by_month (
+    season TEXT, geo_only INTEGER, month_key TEXT, bird_name TEXT, count INTEGER
+);
+CREATE INDEX IF NOT EXISTS sightings_by_month_filter ON sightings_by_month (season, geo_only);
+CREATE TABLE IF NOT EXISTS sightings_by_bird (
+    year INTEGER, season TEXT, geo_only INTEGER, bird_id INTEGER, bird_name TEXT, count INTEGER
+);
+CREATE INDEX IF NOT EXISTS sightings_by_bird_filter ON sightings_by_bird (year, season, geo_only);
+CREATE TABLE IF NOT EXISTS sightings_by_family (
+    year INTEGER, season TEXT, geo_only INTEGER, family TEXT, bird_id INTEGER, bird_name TEXT,
+    scientific_name TEXT, image_url TEXT, count INTEGER
+);
+CREATE INDEX IF NOT EXISTS sightings_by_family_filter ON sightings_by_family (year, season, geo_only);
+CREATE TABLE IF NOT EXISTS sightings_monthly (
+    year INTEGER, season TEXT, geo_only INTEGER, kind TEXT, key TEXT, month INTEGER, count INTEGER
+);
+CREATE INDEX IF NOT EXISTS sightings_monthly_filter ON sightings_monthly (kind, key, year, season, geo_only);
+CREATE TABLE IF NOT EXISTS sightings_years (
+    year INTEGER PRIMARY KEY
+);
+"""
+
+def open_rollups(path=ROLLUP_PATH):
+    """
+    Open the rollup database, creating its tables if needed
+    """
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+def in_radius(latitude, longitude):
+    """
+    Vectorized haversine check of which coordinates lie within GEO_RADIUS_KM of the Toca
+    """
+    lat1 = np.radians(latitude.astype(float))
+    lat2 = np.radians(TOCA_LAT)
+    d_lat = lat2 - lat1
+    d_lon = np.radians(TOCA_LON - longitude.astype(float))
+    a = np.sin(d_lat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(d_lon / 2) ** 2
+    distance = 6371 * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    # Records without coordinates compare as NaN and count as outside
+    return (distance <= GEO_RADIUS_KM).fillna(False)
+
+def daily_counts(records):
+    """
+    Collapse sighting records into counts per day, bird, season and geo flag
+    """
+    ts = pd.to_datetime(records["timestamp"], format="mixed")
+    cube = records.assign(
+        day=ts.dt.strftime("%Y-%m-%d"),
+        geo=in_radius(records["latitude"], records["longitude"]).astype(int),
+    )
+    return cube.groupby(["day", "bird_id", "bird_name", "season", "geo"], as_index=False).agg(
+        first_id=("id", "min"), count=("id", "size"),
+    )
+
+def _catalog_lookup(catalog):
+    by_name = {b["name"]: b for b in catalog}
+    by_id = {b["id"]: b for b in catalog}
+    return by_name, by_id
+
+def _with_catalog(cube, catalog):
+    """
+    Add the family, resolved bird id, scientific name and image of each cube row
+
+    Birds are matched by name first (stable across environments), then by id.
+    `families` lists every family whose birds share the row's name or id,
+    which is how the server filters the monthly series of a family, so a row
+    can count for more than one family there.
+    """
+    by_name, by_id = _catalog_lookup(catalog)
+    info = [by_name.get(name) or by_id.get(bird_id) or {}
+            for name, bird_id in zip(cube["bird_name"], cube["bird_id"])]
+    names, ids = {}, {}
+    for bird in catalog:
+        if bird.get("family"):
+            names.setdefault(bird["name"], set()).add(bird["family"])
+            ids.setdefault(bird["id"], set()).add(bird["family"])
+    return cube.assign(
+        family=[i.get("family") or "Outras" for i in info],
+        families=[sorted(names.get(name, set()) | ids.get(bird_id, set()))
+                  for name, bird_id in zip(cube["bird_name"], cube["bird_id"])],
+        resolved_id=[i.get("id", bird_id) for i, bird_id in zip(info, cube["bird_id"])],
+        scientific_name=[i.get("scientificName", "") for i in info],
+        image_url=[i.get("customImageUrl") or i.get("imageUrl") for i in info],
+    )
+
+def _expand(cube):
+    """
+    Repeat each cube row under every filter it satisfies
+
+    A row counts for its own season and year and for "all" of each, for
+    geo_only=0 always, and for geo_only=1 when it lies within the radius.
+    """
+    frames = []
+    for season_all in (False, True):
+        for year_all in (False, True):
+            for geo_only in (0, 1):
+                frame = cube if geo_only == 0 else cube[cube["geo"] == 1]
+                frames.append(frame.assign(
+                    season_f=ALL_SEASONS if season_all else frame["season"],
+                    year_f=ALL_YEARS if year_all else frame["year"],
+                    geo_only=geo_only,
+                ))
+    return pd.concat(frames, ignore_index=True)
+
+def build_tables(daily, catalog):
+    """
+    Derive every materialized sightings table from the daily counts
+    """
+    days = pd.to_datetime(daily["day"])
+    cube = daily.assign(year=days.dt.year, month=days.dt.month, month_key=days.dt.strftime("%Y-%m"))
+    years = sorted(cube["year"].unique().tolist(), reverse=True)
+
+    cube = cube[cube["bird_id"] != 0].sort_values(["first_id"])
+    if cube.empty:
+        return {"by_month": [], "by_bird": [], "by_family": [], "monthly": [], "years": years}
+    expanded = _expand(_with_catalog(cube, catalog))
+    filters = ["year_f", "season_f", "geo_only"]
+
+    by_month = (expanded[expanded["year_f"] == ALL_YEARS]
+                .groupby(["season_f", "geo_only", "month_key", "bird_name"], as_index=False)["count"].sum())
+
+    by_bird = expanded.groupby(filters + ["bird_name"], as_index=False, sort=False).agg(
+        bird_id=("bird_id", "first"), count=("count", "sum"))
+
+    by_family = expanded.groupby(filters + ["family", "bird_name"], as_index=False, sort=False).agg(
+        bird_id=("resolved_id", "first"), scientific_name=("scientific_name", "first"),
+        image_url=("image_url", "first"), count=("count", "sum"))
+
+    monthly = pd.concat([
+        expanded.groupby(filters + ["bird_id", "month"], as_index=False)["count"].sum()
+                .assign(kind="bird", key=lambda f: f["bird_id"].astype(str)),
+        # An empty list explodes to NaN, which groupby drops
+        expanded.explode("families").groupby(filters + ["families", "month"], as_index=False)["count"].sum()
+                .assign(kind="family", key=lambda f: f["families"]),
+        expanded.groupby(filters + ["month"], as_index=False)["count"].sum()
+                .assign(kind="all", key=""),
+    ], ignore_index=True)
+
+    return {
+        "by_month": by_month[["season_f", "geo_only", "month_key", "bird_name", "count"]],
+        "by_bird": by_bird[filters + ["bird_id", "bird_name", "count"]],
+        "by_family": by_family[filters + ["family", "bird_id", "bird_name", "scientific_name",
+                                          "image_url", "count"]],
+        "monthly": monthly[filters + ["kind", "key", "month", "count"]],
+        "years": years,
+    }
+
+def _rows(frame):
+    if isinstance(frame, list):
+        return frame
+    return [tuple(v.item() if hasattr(v, "item") else v for v in row)
+            for row in frame.itertuples(index=False, name=None)]
+
+def write_tables(conn, tables):
+    """
+    Replace the materialized tables with freshly built ones
+    """
+    for table, columns in [("sightings_by_month", 5), ("sightings_by_bird", 6),
+                           ("sightings_by_family", 9), ("sightings_monthly", 7)]:
+        key = table.replace("sightings_", "")
+        conn.execute(f"DELETE FROM {table}")
+        conn.executemany(f"INSERT INTO {table} VALUES ({','.join('?' * columns)})", _rows(tables[key]))
+    conn.execute("DELETE FROM sightings_years")
+    conn.executemany("INSERT INTO sightings_years VALUES (?)", [(int(y),) for y in tables["years"]])
+
+def update_rollups(source_path, rollup_path=ROLLUP_PATH, json_path=JSON_PATH, table=SOURCE_TABLE):
+    """
+    Fold sighting records appended since the last run into the rollups and rebuild the tables
+    """
+    print(f"Updating sightings rollups from {source_path}...")
+    try:
+        catalog = load_birds(json_path)
+
+        conn = open_rollups(rollup_path)
+        source = sqlite3.connect(source_path)
+        try:
+            row = conn.execute("SELECT last_id FROM rollup_state WHERE source = ?", (table,)).fetchone()
+            last_id = row[0] if row else 0
+            records = pd.read_sql_query(
+                f"SELECT id, bird_id, bird_name, timestamp, latitude, longitude, season "
+                f"FROM {table} WHERE id > ? ORDER BY id",
+                source, params=(last_id,),
+            )
+
+            with conn:
+                if not records.empty:
+                    conn.executemany("""
+                        INSERT INTO rollup_daily VALUES (?,?,?,?,?,?,?)
+                        ON CONFLICT (day, bird_id, bird_name, season, geo) DO UPDATE SET
+                            count = count + excluded.count,
+                            first_id = MIN(first_id, excluded.first_id)
+                    """, _rows(daily_counts(records)[
+                        ["day", "bird_id", "bird_name", "season", "geo", "first_id", "count"]]))
+                    conn.execute(
+                        "INSERT OR REPLACE INTO rollup_state VALUES (?, ?)",
+                        (table, int(records["id"].max())),
+                    )
+                daily = pd.read_sql_query("SELECT * FROM rollup_daily", conn)
+                write_tables(conn, build_tables(daily, catalog))
+        finally:
+            source.close()
+            conn.close()
+
+        print(f"Folded {len(records)} new sighting records into {rollup_path}")
+        return True
+
+    except Exception as e:
+        print(f"Error updating sightings rollups: {str(e)}")
+        return False
+
+def _filter_args(year, season, geo_only):
+    return (year or ALL_YEARS, season or ALL_SEASONS, int(bool(geo_only)))
+
+def _period_start(year, period, today):
+    """
+    Get the first day a relative period counts, or None when there is no period
+
+    The server cuts at the second `days * 24h` before its reference time,
+    which whole-day buckets can only approximate. With a year the reference
+    is December 31 23:59:59, so the window starts the day after the cut and
+    only sightings in the last second of the cut day are missed. Without a
+    year the reference is the current time and the cut day is counted whole,
+    including the sightings earlier that day that the server leaves out.
+    """
+    days = PERIOD_DAYS.get(period)
+    if not days:
+        return None
+    if year:
+        return (date(year, 12, 31) - timedelta(days=days - 1)).isoformat()
+    return ((today or date.today()) - timedelta(days=days)).isoformat()
+
+def sightings_by_month(conn, season=None, geo_only=False):
+    """
+    Read the /api/sightings/by-month rows
+    """
+    rows = conn.execute(
+        "SELECT month_key, bird_name, count FROM sightings_by_month WHERE season = ? AND geo_only = ?",
+        (season or ALL_SEASONS, int(bool(geo_only))),
+    )
+    return [{"monthKey": m, "birdName": b, "count": c} for m, b, c in rows]
+
+def sightings_by_bird(conn, year=None, period=None, season=None, geo_only=False, today=None):
+    """
+    Read the /api/sightings/by-bird rows
+
+    A relative period cannot be materialized, so it is summed from the
+    daily counts, whose size does not grow with the number of sightings.
+    The window is only exact to the day; see _period_start.
+    """
+    start = _period_start(year, period, today)
+    if start is None:
+        rows = conn.execute(
+            "SELECT bird_id, bird_name, count FROM sightings_by_bird "
+            "WHERE year = ? AND season = ? AND geo_only = ?", _filter_args(year, season, geo_only))
+    else:
+        rows = _daily_rows(conn, year, start, season, geo_only)
+    result = [{"birdId": i, "birdName": n, "count": c} for i, n, c in rows]
+    return sorted(result, key=lambda r: -r["count"])
+
+def _daily_rows(conn, year, start, season, geo_only):
+    query = ("SELECT bird_id, bird_name, MIN(first_id), SUM(count) FROM rollup_daily "
+             "WHERE bird_id != 0 AND day >= ?")
+    params = [start]
+    if year:
+        # The window never reaches outside the selected year
+        query += " AND day >= ? AND day <= ?"
+        params += [f"{year}-01-01", f"{year}-12-31"]
+    if season:
+        query += " AND season = ?"
+        params.append(season)
+    if geo_only:
+        query += " AND geo = 1"
+    query += " GROUP BY bird_id, bird_name ORDER BY MIN(first_id)"
+
+    # Birds are keyed by name, with the id of their earliest record, as the server does
+    by_name = {}
+    for bird_id, name, _, count in conn.execute(query, params):
+        if name in by_name:
+            by_name[name][2] += count
+        else:
+            by_name[name] = [bird_id, name, count]
+    return [tuple(row) for row in by_name.values()]
+
+def sightings_by_family(conn, year=None, period=None, season=None, geo_only=False, catalog=None, today=None):
+    """
+    Read the /api/sightings/by-family rows; `catalog` is needed only for relative periods
+    """
+    start = _period_start(year, period, today)
+    if start is None:
+        rows = conn.execute(
+            "SELECT family, bird_id, bird_name, scientific_name, image_url, count FROM sightings_by_family "
+            "WHERE year = ? AND season = ? AND geo_only = ?", _filter_args(year, season, geo_only)).fetchall()
+    else:
+        by_name, by_id = _catalog_lookup(catalog or [])
+        rows = []
+        for bird_id, name, count in _daily_rows(conn, year, start, season, geo_only):
+            info = by_name.get(name) or by_id.get(bird_id) or {}
+            rows.append((info.get("family") or "Outras", info.get("id", bird_id), name,
+                         info.get("scientificName", ""), info.get("customImageUrl") or info.get("imageUrl"),
+                         count))
+
+    families = {}
+    for family, bird_id, name, scientific_name, image_url, count in rows:
+        entry = families.setdefault(family, {"family": family, "count": 0, "birds": []})
+        entry["count"] += count
+        entry["birds"].append({"birdId": bird_id, "birdName": name, "count": count,
+                               "scientificName": scientific_name, "imageUrl": image_url})
+    for entry in families.values():
+        entry["birds"].sort(key=lambda b: -b["count"])
+    return sorted(families.values(), key=lambda f: -f["count"])
+
+def monthly_for_selection(conn, bird_id=None, family=None, year=None, season=None, geo_only=False):
+    """
+    Read the /api/sightings/monthly series: twelve months, zero-filled
+    """
+    if bird_id is not None:
+        kind, key = "bird", str(bird_id)
+    elif family:
+        kind, key = "family", family
+    else:
+        kind, key = "all", ""
+    counts = dict(conn.execute(
+        "SELECT month, count FROM sightings_monthly "
+        "WHERE kind = ? AND key = ? AND year = ? AND season = ? AND geo_only = ?",
+        (kind, key, *_filter_args(year, season, geo_only))))
+    return [{"month": m, "count": counts.get(m, 0)} for m in range(1, 13)]
+
+def available_years(conn):
+    """
+    Read the /api/sightings/years list, newest first
+    """
+    return [y for (y,) in conn.execute("SELECT year FROM sightings_years ORDER BY year DESC")]
+
+if __name__ == "__main__":
+    import sys
+    update_rollups(sys.argv[1] if len(sys.argv) > 1 else "sightings_export.sqlite")
@@ -0,0 +1,18 @@
+"""
+Catalog fixtures shared by the tests of the scripts that publish bird_data.json
+"""
+import json
+
+# Fields every record needs to pass the catalog validation on publish
+CATALOG_FIELDS = {
+    'scientificName': 'Avis exemplaris', 'description': 'Descrição', 'habitat': 'Matas',
+    'diet': 'Frutos', 'wikipediaUrl': 'https://pt.wikipedia.org/wiki/Ave',
+}
+
+
+def write_catalog(path, birds):
+    """
+    Write `birds` to `path`, giving each an id and the required fields it doesn't set
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([{'id': i, **CATALOG_FIELDS, **bird} for i, bird in enumerate(birds, 1)], f, ensure_ascii=False)
@@ -0,0 +1,92 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from bird_record import BirdRecord, load_birds
+from publish import publish_json
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+
+
+class TestBirdRecord(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_catalog_round_trip(self):
+        path = os.path.join(REPO_ROOT, 'bird_data.json')
+        with open(path, encoding='utf-8') as f:
+            original = f.read()
+        out = os.path.join(self.tmp, 'bird_data.json')
+        publish_json(load_birds(path), out)
+        with open(out, encoding='utf-8') as f:
+            self.assertEqual(f.read(), original)
+
+    def test_dict_operations(self):
+        bird = BirdRecord({'id': 1, 'name': 'Saí-azul', 'imageUrl': '/birds/bird-1.jpg'})
+        self.assertEqual(bird.name, 'Saí-azul')
+        self.assertEqual(bird['imageUrl'], '/birds/bird-1.jpg')
+        self.assertIsNone(bird.get('family'))
+        self.assertNotIn('family', bird)
+        with self.assertRaises(KeyError):
+            bird['family']
+
+        bird.update({'family': 'Thraupidae'}, diet='Frutos')
+        self.assertEqual(list(bird.keys()), ['id', 'name', 'family', 'diet', 'imageUrl'])
+        self.assertEqual(bird, dict(bird))
+        self.assertFalse(hasattr(bird, '__dict__'))
+
+    def test_missing_and_unknown_fields_survive_publish(self):
+        path = os.path.join(self.tmp, 'birds.json')
+        birds = [{'id': 1, 'name': 'Saí-azul', 'identification': None, 'apelido': 'saí'}]
+        publish_json(birds, path)
+        loaded = load_birds(path)
+        self.assertEqual(loaded[0].extra, {'apelido': 'saí'})
+        publish_json(loaded, path)
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), birds)
+
+    def test_low_cardinality_fields_are_interned(self):
+        path = os.path.join(self.tmp, 'birds.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump([{'id': i, 'name': f'Ave {i}', 'family': 'Thraupidae', 'sexualDimorphism': 'Sim'}
+                       for i in range(3)], f)
+        birds = load_birds(path)
+        self.assertIs(birds[0].family, birds[2].family)
+        self.assertIs(birds[0].sexualDimorphism, birds[1].sexualDimorphism)
+
+    def test_not_a_list_of_birds(self):
+        path = os.path.join(self.tmp, 'birds.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'id': 1}, f)
+        with self.assertRaises(ValueError):
+            load_birds(path)
+
+    def test_records_use_less_memory_than_dicts(self):
+        path = os.path.join(REPO_ROOT, 'bird_data.json')
+        with open(path, encoding='utf-8') as f:
+            raw = f.read()
+
+        def allocated(load):
+            tracemalloc.start()
+            data = load()
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del data
+            return size
+
+        as_dicts = allocated(lambda: json.loads(raw))
+        as_records = allocated(lambda: [BirdRecord(b) for b in json.loads(raw)])
+        self.assertLess(as_records, as_dicts)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import openpyxl
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from export_excel import EXPORT_COLUMNS, export_catalog_excel
+from merge_workbooks import COLUMN_MAP, PREFERRED_SHEET, parse_workbook
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+
+
+class TestExportExcel(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.output = os.path.join(self.tmp, 'export.xlsx')
+        self.json_path = os.path.join(REPO_ROOT, 'bird_data.json')
+        with open(self.json_path, encoding='utf-8') as f:
+            self.birds = json.load(f)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_headers_map_back_to_fields(self):
+        for title, field in EXPORT_COLUMNS[1:]:
+            self.assertEqual(COLUMN_MAP[title], field)
+
+    def test_export_layout(self):
+        self.assertTrue(export_catalog_excel(self.json_path, self.output))
+        workbook = openpyxl.load_workbook(self.output)
+        sheet = workbook[PREFERRED_SHEET]
+        header = [c.value for c in sheet[1]]
+        self.assertEqual(header, [title for title, _ in EXPORT_COLUMNS])
+        self.assertTrue(sheet['A1'].font.bold)
+        self.assertEqual(sheet.max_row, len(self.birds) + 1)
+        self.assertEqual(sheet.freeze_panes, 'C2')
+
+        bird = self.birds[0]
+        self.assertEqual(sheet['A2'].value, bird['id'])
+        self.assertEqual(sheet['B2'].value, bird['name'])
+        link = sheet.cell(row=2, column=header.index('wikipedia') + 1)
+        self.assertEqual(link.value, bird['wikipediaUrl'])
+        self.assertEqual(link.hyperlink.target, bird['wikipediaUrl'])
+        # Site-relative images are plain text
+        picture = sheet.cell(row=2, column=header.index('Picture') + 1)
+        self.assertEqual(picture.value, bird['imageUrl'])
+        self.assertIsNone(picture.hyperlink)
+
+    def test_round_trip_through_merge(self):
+        self.assertTrue(export_catalog_excel(self.json_path, self.output))
+        records = {r['name']: r for r in parse_workbook(self.output)}
+        self.assertEqual(len(records), len(self.birds))
+        for bird in self.birds:
+            record = records[bird['name']]
+            for field, value in bird.items():
+                if field == 'id':
+                    continue
+                # Merging strips surrounding whitespace from the cells
+                expected = value.strip() if isinstance(value, str) else value
+                self.assertEqual(record.get(field), expected, f"{bird['name']}: {field}")
+
+    def test_large_catalog(self):
+        big = [{**bird, 'id': i, 'name': f"{bird['name']} {i}"}
+               for i, bird in enumerate(self.birds * 30)]
+        path = os.path.join(self.tmp, 'big.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(big, f, ensure_ascii=False)
+        self.assertTrue(export_catalog_excel(path, self.output))
+        workbook = openpyxl.load_workbook(self.output, read_only=True)
+        rows = sum(1 for _ in workbook[PREFERRED_SHEET].iter_rows(values_only=True))
+        self.assertEqual(rows, len(big) + 1)
+        workbook.close()
+
+    def test_missing_json(self):
+        self.assertFalse(export_catalog_excel('/nao/existe/bird_data.json', self.output))
+        self.assertFalse(os.path.exists(self.output))
+
+
+if __name__ == '__main__':
+    unittest.main()
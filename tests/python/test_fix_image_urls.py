@@ -5,6 +5,7 @@ import tempfile
 import unittest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from catalog_fixture import write_catalog
 from fix_image_urls import DIRECT_URLS, fix_bird_images
 
 
@@ -22,8 +23,7 @@ class TestFixBirdImages(unittest.TestCase):
             os.unlink(self.path)
 
     def _write(self, data):
-        with open(self.path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False)
+        write_catalog(self.path, data)
 
     def _read(self):
         with open(self.path, encoding='utf-8') as f:
@@ -66,6 +66,15 @@ class TestFixBirdImages(unittest.TestCase):
     def test_returns_false_on_missing_file(self):
         self.assertFalse(fix_bird_images('/nonexistent/path/file.json'))
 
+    def test_invalid_catalog_is_not_written(self):
+        name = next(iter(DIRECT_URLS))
+        self._write([{'name': name, 'imageUrl': 'https://old.jpg', 'wikipediaUrl': 'wikipedia/Ave'}])
+        with open(self.path, encoding='utf-8') as f:
+            before = f.read()
+        self.assertFalse(fix_bird_images(self.path))
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), before)
+
     def test_mixed_birds_processed_correctly(self):
         known_name = next(iter(DIRECT_URLS))
         original_url = 'https://upload.wikimedia.org/wikipedia/commons/x/bird.jpg'
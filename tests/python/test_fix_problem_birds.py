@@ -6,6 +6,7 @@ import tempfile
 import unittest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from catalog_fixture import write_catalog
 from fix_problem_birds import fix_problem_birds
 
 PROBLEM_BIRDS = [
@@ -26,8 +27,7 @@ class TestFixProblemBirds(unittest.TestCase):
         shutil.rmtree(self.tmpdir, ignore_errors=True)
 
     def _run(self, birds):
-        with open('bird_data.json', 'w', encoding='utf-8') as f:
-            json.dump(birds, f, ensure_ascii=False)
+        write_catalog('bird_data.json', birds)
         fix_problem_birds()
         with open('bird_data.json', encoding='utf-8') as f:
             return json.load(f)
@@ -63,6 +63,10 @@ class TestFixProblemBirds(unittest.TestCase):
         self.assertIn('wikiaves', result[0]['imageUrl'])
         self.assertEqual(result[1]['imageUrl'], 'https://other.jpg')
 
+    def test_invalid_catalog_is_not_written(self):
+        result = self._run([{'name': 'Saíra-sete-cores', 'imageUrl': 'https://old.jpg', 'diet': ''}])
+        self.assertEqual(result[0]['imageUrl'], 'https://old.jpg')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,174 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from lab_snapshot import open_snapshot, update_lab_snapshot
+
+
+def _obs(obs_id, name, observed_on):
+    return {
+        'id': obs_id,
+        'taxon': {'id': obs_id * 10, 'name': name, 'preferred_common_name': name.upper(),
+                  'default_photo': {'square_url': f'https://img/{obs_id}.jpg'}},
+        'observed_on': observed_on,
+        'place_guess': 'Ilhabela',
+        'user': {'login': 'gisele'},
+        'location': '-23.8,-45.3',
+    }
+
+
+def _occ(key, species, event_date):
+    return {
+        'key': key, 'species': species, 'vernacularName': species.lower(),
+        'eventDate': event_date, 'year': int(event_date[:4]), 'month': int(event_date[5:7]),
+        'decimalLatitude': -23.8, 'decimalLongitude': -45.3,
+    }
+
+
+class StubApi:
+    """Imitates the paginated iNat and GBIF endpoints used by the snapshot job"""
+
+    def __init__(self):
+        self.observations = []
+        self.species_counts = []
+        self.occurrences = []
+        self.requests = []
+
+    def handle(self, path, query):
+        self.requests.append((path, query))
+        if path == '/inat/observations':
+            items = [o for o in self.observations if o['observed_on'] >= query.get('d1', '')]
+            return self._page(items, query)
+        if path == '/inat/observations/species_counts':
+            return self._page(self.species_counts, query)
+        if path == '/gbif/occurrence/search':
+            since = query.get('eventDate', ',').split(',')[0]
+            items = [o for o in self.occurrences if o['eventDate'][:10] >= since]
+            offset, limit = int(query['offset']), int(query['limit'])
+            return {'count': len(items), 'results': items[offset:offset + limit],
+                    'endOfRecords': offset + limit >= len(items)}
+        return None
+
+    def _page(self, items, query):
+        per_page, page = int(query['per_page']), int(query['page'])
+        start = (page - 1) * per_page
+        return {'total_results': len(items), 'page': page, 'per_page': per_page,
+                'results': items[start:start + per_page]}
+
+
+class TestLabSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.api = StubApi()
+        api = self.api
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                payload = api.handle(url.path, query)
+                body = json.dumps(payload).encode()
+                self.send_response(200 if payload is not None else 404)
+                self.send_header('Content-Type', 'application/json')
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        base = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.inat_api = base + '/inat'
+        self.gbif_api = base + '/gbif'
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'lab.sqlite')
+        self.export_dir = os.path.join(self.tmpdir, 'export')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _update(self):
+        return update_lab_snapshot(self.path, self.export_dir, self.inat_api, self.gbif_api, workers=3)
+
+    def _export(self, name):
+        with open(os.path.join(self.export_dir, name), encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_fetches_every_page_concurrently(self):
+        self.api.observations = [_obs(i, 'Dacnis cayana', f'2024-0{i % 9 + 1}-01') for i in range(1, 451)]
+        self.api.occurrences = [_occ(i, 'Tangara seledon', '2023-12-05T10:00') for i in range(1, 701)]
+        self.api.species_counts = [{'count': 5, 'taxon': {'id': 1, 'name': 'Dacnis cayana'}}]
+        self.assertTrue(self._update())
+
+        inat = self._export('inat.json')
+        self.assertEqual(inat['total_results'], 450)
+        self.assertEqual(len({o['id'] for o in inat['results']}), 450)
+        self.assertEqual(self._export('gbif.json')['count'], 700)
+        # 3 iNat observation pages, 1 species page and 3 GBIF pages
+        self.assertEqual(len(self.api.requests), 7)
+
+    def test_exports_match_api_shape(self):
+        self.api.observations = [_obs(1, 'Dacnis cayana', '2024-01-15')]
+        self.api.species_counts = [{'count': 3, 'taxon': {'id': 7, 'name': 'Dacnis cayana',
+                                                          'default_photo': {'square_url': 'p.jpg'}}}]
+        self.api.occurrences = [_occ(9, 'Tangara seledon', '2024-07-01')]
+        self._update()
+        self.assertEqual(self._export('inat.json')['results'][0], _obs(1, 'Dacnis cayana', '2024-01-15'))
+        species = self._export('inat-species.json')['results'][0]
+        self.assertEqual(species['count'], 3)
+        self.assertEqual(species['taxon']['default_photo'], {'square_url': 'p.jpg'})
+        self.assertEqual(self._export('gbif.json')['results'][0], _occ(9, 'Tangara seledon', '2024-07-01'))
+
+    def test_incremental_update_fetches_only_newer(self):
+        self.api.observations = [_obs(1, 'Dacnis cayana', '2024-01-15')]
+        self.api.occurrences = [_occ(1, 'Tangara seledon', '2024-01-10')]
+        self._update()
+
+        self.api.observations.append(_obs(2, 'Tangara seledon', '2024-03-02'))
+        self.api.occurrences.append(_occ(2, 'Dacnis cayana', '2024-02-01'))
+        self.api.requests.clear()
+        self._update()
+
+        queries = dict(self.api.requests)
+        self.assertEqual(queries['/inat/observations']['d1'], '2024-01-15')
+        self.assertEqual(queries['/gbif/occurrence/search']['eventDate'], '2024-01-10,*')
+        self.assertEqual(self._export('inat.json')['total_results'], 2)
+        self.assertEqual(self._export('gbif.json')['count'], 2)
+
+    def test_month_and_season_aggregates(self):
+        self.api.observations = [
+            _obs(1, 'Dacnis cayana', '2024-01-15'),
+            _obs(2, 'Dacnis cayana', '2023-12-01'),
+            _obs(3, 'Tangara seledon', '2024-07-01'),
+        ]
+        self.api.occurrences = [_occ(1, 'Dacnis cayana', '2024-01-10')]
+        self._update()
+        aggregates = self._export('aggregates.json')
+        self.assertEqual(aggregates['inat']['months']['1'],
+                         {'observations': 1, 'species': {'Dacnis cayana': 1}})
+        self.assertEqual(aggregates['inat']['seasons']['summer'],
+                         {'observations': 2, 'species': {'Dacnis cayana': 2}})
+        self.assertEqual(aggregates['inat']['seasons']['winter']['species'], {'Tangara seledon': 1})
+        self.assertEqual(aggregates['gbif']['seasons']['summer']['observations'], 1)
+
+    def test_returns_false_when_api_fails(self):
+        self.inat_api = self.inat_api.replace('/inat', '/missing')
+        self.assertFalse(self._update())
+        conn = open_snapshot(self.path)
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM inat_observations').fetchone()[0], 0)
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
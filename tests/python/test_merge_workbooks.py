@@ -0,0 +1,138 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import openpyxl
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from merge_workbooks import (
+    find_workbooks, merge_records, merge_workbooks, parse_workbook, parse_workbooks,
+    species_key, workbook_timestamp,
+)
+
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'attached_assets')
+
+
+def _write_workbook(path, header, rows, sheet_title=None):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    if sheet_title:
+        workbook.create_sheet('overview', 0)
+        sheet.title = sheet_title
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+
+
+class TestMergeWorkbooks(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.output = os.path.join(self.tmpdir, 'merged.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _path(self, name):
+        return os.path.join(self.tmpdir, name)
+
+    def test_timestamp_from_file_name(self):
+        path = self._path('birds_1777765095634.xlsx')
+        open(path, 'w').close()
+        self.assertEqual(workbook_timestamp(path), 1777765095.634)
+
+    def test_timestamp_falls_back_to_mtime(self):
+        path = self._path('aves_Toca_v2.xlsx')
+        open(path, 'w').close()
+        os.utime(path, (1000, 1000))
+        self.assertEqual(workbook_timestamp(path), 1000)
+
+    def test_find_workbooks_ignores_other_files(self):
+        for name in ['birds_1.xlsx', 'aves_Toca_v2 (1).xlsx', 'notes.xlsx', 'birds_2.csv']:
+            open(self._path(name), 'w').close()
+        found = [os.path.basename(p) for p in find_workbooks(self.tmpdir)]
+        self.assertEqual(found, ['aves_Toca_v2 (1).xlsx', 'birds_1.xlsx'])
+
+    def test_parse_maps_toca_columns(self):
+        path = self._path('aves_Toca_v2.xlsx')
+        _write_workbook(path, ['Espécie', 'Nome Comum', 'Picture', 'Outra'], [
+            ['Dacnis cayana', 'Saí-azul', 'https://a.jpg', 'x'],
+        ])
+        self.assertEqual(parse_workbook(path), [{
+            'scientificName': 'Dacnis cayana', 'name': 'Saí-azul', 'imageUrl': 'https://a.jpg',
+        }])
+
+    def test_parse_prefers_editorial_sheet(self):
+        path = self._path('birds_catalogue_final_1777931874641.xlsx')
+        _write_workbook(path, ['common_name', 'scientific_name', 'size_length_cm'], [
+            ['Saí-azul', 'Dacnis cayana', 13.5],
+        ], sheet_title='catalogue_editorial_pt')
+        record = parse_workbook(path)[0]
+        self.assertEqual(record['name'], 'Saí-azul')
+        self.assertEqual(record['sizeLength'], '13,5')
+
+    def test_parse_skips_rows_without_species(self):
+        path = self._path('birds_1.xlsx')
+        _write_workbook(path, ['name', 'diet'], [[None, 'Frutos'], ['Saí-azul', None]])
+        self.assertEqual(parse_workbook(path), [{'name': 'Saí-azul'}])
+
+    def test_newest_value_wins_per_field(self):
+        parsed = [
+            ('new.xlsx', 200, [{'scientificName': 'Dacnis cayana', 'diet': 'Frutos'}]),
+            ('old.xlsx', 100, [{'scientificName': 'Dacnis  Cayana', 'diet': 'Insetos', 'habitat': 'Matas'}]),
+        ]
+        merged = merge_records(parsed)
+        self.assertEqual(len(merged), 1)
+        self.assertEqual(merged[0]['diet'], 'Frutos')
+        self.assertEqual(merged[0]['habitat'], 'Matas')
+        self.assertEqual(merged[0]['provenance']['diet'], {'source': 'new.xlsx', 'timestamp': 200})
+        self.assertEqual(merged[0]['provenance']['habitat']['source'], 'old.xlsx')
+
+    def test_named_snapshots_outrank_mtime(self):
+        parsed = [
+            ('birds_1777765095634.xlsx', 1777765095.634, [{'scientificName': 'Dacnis cayana', 'diet': 'Frutos'}]),
+            # A fresh checkout makes the raw source look newer than every snapshot
+            ('aves_Toca_v2.xlsx', 1900000000, [{'scientificName': 'Dacnis cayana', 'diet': 'Insetos'}]),
+            ('aves_Toca_v2 (1).xlsx', 1800000000, [{'scientificName': 'Dacnis cayana', 'habitat': 'Matas'}]),
+        ]
+        merged = merge_records(parsed)[0]
+        self.assertEqual(merged['diet'], 'Frutos')
+        self.assertEqual(merged['provenance']['diet']['source'], 'birds_1777765095634.xlsx')
+        self.assertEqual(merged['habitat'], 'Matas')
+
+    def test_newest_final_catalogue_wins_in_assets(self):
+        paths = find_workbooks(ASSETS_DIR)
+        newest = max((p for p in paths if os.path.basename(p).startswith('birds_catalogue_final_')),
+                     key=workbook_timestamp)
+        merged = {r['key']: r for r in merge_records(parse_workbooks(paths))}
+        for record in parse_workbook(newest):
+            bird = merged[species_key(record)]
+            for field, value in record.items():
+                self.assertEqual(bird[field], value, f"{record['name']}: {field}")
+                self.assertEqual(bird['provenance'][field]['source'], os.path.basename(newest))
+
+    def test_merge_writes_output_with_process_pool(self):
+        _write_workbook(self._path('birds_1000000000000.xlsx'), ['name', 'scientific_name', 'diet'], [
+            ['Saí-azul', 'Dacnis cayana', 'Frutos'],
+        ])
+        _write_workbook(self._path('birds_2000000000000.xlsx'), ['name', 'scientific_name', 'diet'], [
+            ['Saí-azul', 'Dacnis cayana', 'Néctar'],
+            ['Saí-verde', 'Chlorophanes spiza', 'Frutos'],
+        ])
+        merged = merge_workbooks(self.tmpdir, self.output, workers=2)
+        with open(self.output, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), merged)
+        self.assertEqual([b['name'] for b in merged], ['Saí-verde', 'Saí-azul'])
+        self.assertEqual(merged[1]['diet'], 'Néctar')
+
+    def test_returns_none_when_no_workbooks(self):
+        self.assertIsNone(merge_workbooks(self.tmpdir, self.output))
+        self.assertFalse(os.path.exists(self.output))
+
+
+if __name__ == '__main__':
+    unittest.main()
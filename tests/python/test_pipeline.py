@@ -0,0 +1,86 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+sys.path.insert(0, ROOT)
+import pipeline
+
+HEAVY_MODULES = ['pandas', 'numpy', 'requests', 'bs4']
+PIPELINE_MODULES = [
+    'pipeline', 'check_excel', 'update_bird_data', 'scrape_wikiaves', 'scrape_wiki_images',
+    'fix_image_urls', 'fix_problem_birds', 'merge_workbooks', 'watch_catalog',
+    'validate_catalog', 'publish', 'search_index', 'lab_snapshot',
+    'resolve_taxa', 'sightings_rollup', 'sightings_report', 'bird_record',
+    'export_excel', 'scrape_queue',
+]
+# Importing every pipeline module must stay well under the cost of loading pandas
+IMPORT_BUDGET_SECONDS = 0.15
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    __import__(name)
+elapsed = time.perf_counter() - start
+# Modules deferred by lazy_import sit in sys.modules but have not run yet
+loaded = [n for n, m in sys.modules.items() if type(m).__name__ != '_LazyModule']
+print(json.dumps({'elapsed': elapsed, 'loaded': sorted(loaded)}))
+"""
+
+
+def _probe(modules):
+    out = subprocess.run(
+        [sys.executable, '-c', PROBE, *modules],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout)
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_heavy_modules_not_loaded_on_import(self):
+        loaded = set(_probe(PIPELINE_MODULES)['loaded'])
+        for name in HEAVY_MODULES:
+            self.assertNotIn(name, loaded, f"{name} não deve ser carregado na importação")
+
+    def test_import_within_budget(self):
+        # Take the best of a few runs to avoid flakiness on a busy machine
+        elapsed = min(_probe(PIPELINE_MODULES)['elapsed'] for _ in range(3))
+        self.assertLess(elapsed, IMPORT_BUDGET_SECONDS)
+
+
+class TestPipelineCli(unittest.TestCase):
+
+    def test_requires_a_command(self):
+        with self.assertRaises(SystemExit):
+            pipeline.main([])
+
+    @patch('validate_catalog.validate_catalog_file', return_value=True)
+    def test_fix_problem_birds_dispatches(self, _validate):
+        with patch('fix_problem_birds.fix_problem_birds') as mock_fix:
+            self.assertEqual(pipeline.main(['fix-problem-birds']), 0)
+        mock_fix.assert_called_once_with()
+
+    @patch('validate_catalog.validate_catalog_file', return_value=True)
+    def test_fix_image_urls_passes_json_path(self, mock_validate):
+        with patch('fix_image_urls.fix_bird_images', return_value=True) as mock_fix:
+            self.assertEqual(pipeline.main(['fix-image-urls', '--json-path', 'x.json']), 0)
+        mock_fix.assert_called_once_with('x.json')
+        mock_validate.assert_called_once_with('x.json')
+
+    @patch('validate_catalog.validate_catalog_file', return_value=False)
+    def test_invalid_catalog_after_write_returns_nonzero(self, _validate):
+        with patch('fix_problem_birds.fix_problem_birds'):
+            self.assertEqual(pipeline.main(['fix-problem-birds']), 1)
+
+    def test_failed_command_returns_nonzero(self):
+        with patch('scrape_wiki_images.fix_bird_data_json', return_value=False):
+            self.assertEqual(pipeline.main(['scrape-wiki-images']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import json
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from publish import publish_json
+
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+class TestPublishJson(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'bird_data.json')
+        self.umask = os.umask(0o022)
+
+    def tearDown(self):
+        os.umask(self.umask)
+        shutil.rmtree(self.tmp)
+
+    def test_replaces_file(self):
+        publish_json([{'id': 1}], self.path)
+        publish_json([{'id': 2}], self.path)
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), [{'id': 2}])
+        self.assertEqual(os.listdir(self.tmp), ['bird_data.json'])
+
+    def test_keeps_existing_mode(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('[]')
+        os.chmod(self.path, 0o644)
+        publish_json([{'id': 1}], self.path)
+        self.assertEqual(_mode(self.path), 0o644)
+
+        os.chmod(self.path, 0o640)
+        publish_json([{'id': 1}], self.path)
+        self.assertEqual(_mode(self.path), 0o640)
+
+    def test_new_file_follows_umask(self):
+        publish_json([], self.path)
+        self.assertEqual(_mode(self.path), 0o644)
+
+
+if __name__ == '__main__':
+    unittest.main()
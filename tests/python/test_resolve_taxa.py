@@ -0,0 +1,188 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, urlparse
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+sys.path.insert(0, REPO_ROOT)
+from resolve_taxa import pick_taxon, resolve_catalog_taxa, resolve_names
+
+TAXA = {
+    'Dacnis cayana': [
+        {'id': 1, 'name': 'Dacnis cayana', 'rank': 'species', 'preferred_common_name': 'Blue Dacnis',
+         'default_photo': {'square_url': 'https://img/1.jpg'}, 'observations_count': 900},
+    ],
+    # iNat answers an outdated name with the accepted taxon and the synonym as matched_term
+    'Tachyphonus coronatus': [
+        {'id': 2, 'name': 'Loriotus cristatus', 'rank': 'genus'},
+        {'id': 3, 'name': 'Tachyphonus cristatus', 'rank': 'species', 'matched_term': 'Tachyphonus'},
+        {'id': 4, 'name': 'Loriotus coronatus', 'rank': 'species',
+         'matched_term': 'Tachyphonus coronatus', 'observations_count': 50},
+    ],
+}
+
+
+def _resp(results):
+    m = MagicMock()
+    m.json.return_value = {'results': results}
+    m.raise_for_status = MagicMock()
+    return m
+
+
+def _fake_get(url, params=None, **kwargs):
+    return _resp(TAXA.get(params['q'], []))
+
+
+def _bird(bird_id, name, scientific_name):
+    return {
+        'id': bird_id, 'name': name, 'scientificName': scientific_name,
+        'description': 'Descrição', 'habitat': 'Matas', 'diet': 'Frutos',
+        'imageUrl': f'/birds/bird-{bird_id}.jpg',
+        'wikipediaUrl': 'https://pt.wikipedia.org/wiki/' + scientific_name.replace(' ', '_'),
+    }
+
+
+class TestPickTaxon(unittest.TestCase):
+
+    def test_exact_name(self):
+        self.assertEqual(pick_taxon('dacnis cayana', TAXA['Dacnis cayana'])['id'], 1)
+
+    def test_synonym_via_matched_term(self):
+        self.assertEqual(pick_taxon('Tachyphonus coronatus', TAXA['Tachyphonus coronatus'])['id'], 4)
+
+    def test_no_species_match(self):
+        self.assertIsNone(pick_taxon('Dacnis cayana', [{'id': 9, 'name': 'Dacnis', 'rank': 'genus'}]))
+
+
+@patch('resolve_taxa.requests.get', side_effect=_fake_get)
+class TestResolveNames(unittest.TestCase):
+
+    def test_fetches_only_missing_or_stale(self, mock_get):
+        cache = {
+            'dacnis cayana': {'taxon': None, 'fetchedAt': 1000},
+            'tachyphonus coronatus': {'taxon': None, 'fetchedAt': 100},
+        }
+        fetched = resolve_names(['Dacnis cayana', 'Tachyphonus coronatus'], cache, ttl=500, now=1200)
+        self.assertEqual(fetched, 1)
+        self.assertEqual(mock_get.call_args.kwargs['params']['q'], 'Tachyphonus coronatus')
+        self.assertIsNone(cache['dacnis cayana']['taxon'])
+
+    def test_synonym_tracked_and_accepted_name_cached(self, mock_get):
+        cache = {}
+        resolve_names(['Tachyphonus coronatus'], cache, now=0)
+        self.assertEqual(cache['tachyphonus coronatus']['synonymOf'], 'Loriotus coronatus')
+        self.assertEqual(cache['loriotus coronatus']['taxon']['id'], 4)
+        self.assertEqual(resolve_names(['Loriotus coronatus'], cache, now=1), 0)
+
+    def test_failed_lookup_not_cached(self, mock_get):
+        mock_get.side_effect = Exception('Timeout')
+        cache = {}
+        self.assertEqual(resolve_names(['Dacnis cayana'], cache), 0)
+        self.assertEqual(cache, {})
+
+
+@patch('resolve_taxa.requests.get', side_effect=_fake_get)
+class TestResolveCatalogTaxa(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.json_path = os.path.join(self.tmpdir, 'bird_data.json')
+        self.cache_path = os.path.join(self.tmpdir, 'cache.json')
+        with open(self.json_path, 'w', encoding='utf-8') as f:
+            json.dump([
+                _bird(1, 'Saí-azul', 'Dacnis cayana'),
+                _bird(2, 'Tiê-preto', 'Tachyphonus coronatus'),
+                _bird(3, 'Ave rara', 'Avis inexistens'),
+            ], f, ensure_ascii=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _read(self):
+        with open(self.json_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_stores_taxon_fields_on_records(self, mock_get):
+        self.assertTrue(resolve_catalog_taxa(self.json_path, self.cache_path))
+        birds = self._read()
+        self.assertEqual(birds[0]['inatTaxonId'], 1)
+        self.assertEqual(birds[0]['inatCommonName'], 'Blue Dacnis')
+        self.assertEqual(birds[0]['inatPhotoUrl'], 'https://img/1.jpg')
+        self.assertEqual(birds[0]['inatObservationsCount'], 900)
+        self.assertEqual(birds[1]['inatTaxonName'], 'Loriotus coronatus')
+        self.assertIsNone(birds[2]['inatTaxonId'])
+
+    def test_second_run_uses_cache(self, mock_get):
+        resolve_catalog_taxa(self.json_path, self.cache_path)
+        mock_get.reset_mock()
+        before = os.stat(self.json_path).st_mtime_ns
+        self.assertTrue(resolve_catalog_taxa(self.json_path, self.cache_path))
+        mock_get.assert_not_called()
+        self.assertEqual(os.stat(self.json_path).st_mtime_ns, before)
+
+    def test_changed_species_is_looked_up(self, mock_get):
+        resolve_catalog_taxa(self.json_path, self.cache_path)
+        birds = self._read()
+        birds[2]['scientificName'] = 'Dacnis nigripes'
+        with open(self.json_path, 'w', encoding='utf-8') as f:
+            json.dump(birds, f, ensure_ascii=False)
+        mock_get.reset_mock()
+        resolve_catalog_taxa(self.json_path, self.cache_path)
+        self.assertEqual([c.kwargs['params']['q'] for c in mock_get.call_args_list], ['Dacnis nigripes'])
+
+    def test_returns_false_on_missing_file(self, mock_get):
+        self.assertFalse(resolve_catalog_taxa(os.path.join(self.tmpdir, 'x.json'), self.cache_path))
+
+
+class _TaxaHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        name = parse_qs(urlparse(self.path).query)['q'][0]
+        body = json.dumps({'results': [{'id': 1, 'name': name, 'rank': 'species'}]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+# Runs in a fresh interpreter, where requests has not been loaded yet
+RESOLVE = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from resolve_taxa import resolve_names
+cache = {}
+print(resolve_names([f'Avis {i}' for i in range(20)], cache, api=sys.argv[2], delay=0))
+"""
+
+
+class TestResolveNamesFreshProcess(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _TaxaHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_lazy_requests_is_loaded_before_the_pool(self):
+        api = f'http://127.0.0.1:{self.server.server_port}'
+        out = subprocess.run([sys.executable, '-c', RESOLVE, REPO_ROOT, api],
+                             capture_output=True, text=True, check=True).stdout
+        self.assertNotIn('Error resolving', out)
+        self.assertEqual(out.splitlines()[-1], '20')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from bird_record import BirdRecord
+from scrape_queue import (
+    claim_job, complete_job, enqueue_catalog, fail_job, merge, open_queue, queue_status,
+    run_worker, run_workers,
+)
+from scrape_wiki_images import DIRECT_URLS, fix_bird_data_json
+
+
+def _bird(bird_id, name, image_url='/birds/bird.jpg', wikiaves=True):
+    return {
+        'id': bird_id, 'name': name, 'scientificName': f'Avis {name.lower()}',
+        'description': 'Descrição', 'habitat': 'Matas', 'diet': 'Frutos',
+        'imageUrl': image_url,
+        'wikipediaUrl': f'https://pt.wikipedia.org/wiki/{name}',
+        'wikiavesUrl': f'https://www.wikiaves.com.br/wiki/{name.lower()}' if wikiaves else None,
+    }
+
+
+CATALOG = [
+    _bird(1, 'Alfa'),
+    _bird(2, 'Beta', wikiaves=False),
+    # Already a direct Wikimedia image, so skipped for Wikipedia
+    _bird(3, 'Gama', image_url='https://upload.wikimedia.org/wikipedia/commons/a/a0/Gama.jpg'),
+    # Has a predefined URL in scrape_wiki_images.DIRECT_URLS
+    _bird(4, 'Tiê-sangue'),
+]
+
+
+def fake_wikipedia(url):
+    # Module-level so forked pool workers can use it
+    name = url.rsplit('/', 1)[-1]
+    if name == 'Delta':
+        return None
+    return f'https://upload.wikimedia.org/wikipedia/commons/{name}.jpg'
+
+
+def fake_wikiaves(url):
+    if url.endswith('alfa'):
+        raise ConnectionError('timed out')
+    return None
+
+
+FETCHERS = {'wikipedia': fake_wikipedia, 'wikiaves': fake_wikiaves}
+
+
+class TestScrapeQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.queue_path = os.path.join(self.tmp, 'queue.sqlite')
+        self.json_path = os.path.join(self.tmp, 'bird_data.json')
+        with open(self.json_path, 'w', encoding='utf-8') as f:
+            json.dump(CATALOG, f, ensure_ascii=False)
+        self.conn = open_queue(self.queue_path)
+        self.birds = [BirdRecord(b) for b in CATALOG]
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.tmp)
+
+    def test_enqueue_one_job_per_species(self):
+        self.assertEqual(enqueue_catalog(self.conn, self.birds, 'wikipedia'), 2)
+        self.assertEqual(enqueue_catalog(self.conn, self.birds, 'wikiaves'), 3)
+        # Re-queueing keeps the existing jobs
+        self.assertEqual(enqueue_catalog(self.conn, self.birds, 'wikipedia'), 0)
+        self.assertEqual(queue_status(self.conn), {'wikiaves': {'pending': 3}, 'wikipedia': {'pending': 2}})
+
+    def test_leases_are_exclusive_until_they_expire(self):
+        enqueue_catalog(self.conn, self.birds[:1], 'wikipedia')
+        job = claim_job(self.conn, 'w1', lease_seconds=60, now=1000)
+        self.assertEqual(job[:2], ('wikipedia', 'Alfa'))
+        self.assertIsNone(claim_job(self.conn, 'w2', lease_seconds=60, now=1030))
+
+        # w1 died; once the lease expires w2 takes over and w1 can no longer report
+        retry = claim_job(self.conn, 'w2', lease_seconds=60, now=1061)
+        self.assertEqual(retry[3], 2)
+        self.assertFalse(complete_job(self.conn, job, 'w1', 'https://img/old.jpg'))
+        self.assertTrue(complete_job(self.conn, retry, 'w2', 'https://img/new.jpg'))
+        self.assertEqual(queue_status(self.conn), {'wikipedia': {'done': 1}})
+
+    def test_failures_are_retried_up_to_max_attempts(self):
+        enqueue_catalog(self.conn, self.birds[:1], 'wikipedia')
+        for attempt in range(1, 4):
+            job = claim_job(self.conn, 'w1', max_attempts=3)
+            self.assertEqual(job[3], attempt)
+            self.assertTrue(fail_job(self.conn, job, 'w1', 'HTTP 503', max_attempts=3))
+        self.assertIsNone(claim_job(self.conn, 'w1', max_attempts=3))
+        self.assertEqual(self.conn.execute("SELECT status, error FROM jobs").fetchone(), ('failed', 'HTTP 503'))
+
+    def test_expired_last_attempt_is_marked_failed(self):
+        enqueue_catalog(self.conn, self.birds[:1], 'wikipedia')
+        claim_job(self.conn, 'w1', lease_seconds=10, max_attempts=1, now=0)
+        self.assertIsNone(claim_job(self.conn, 'w2', max_attempts=1, now=20))
+        self.assertEqual(queue_status(self.conn), {'wikipedia': {'failed': 1}})
+
+    def test_worker_runs_every_job(self):
+        enqueue_catalog(self.conn, self.birds, 'wikipedia')
+        enqueue_catalog(self.conn, self.birds, 'wikiaves')
+        ran = run_worker(self.queue_path, 'w1', max_attempts=2, fetchers=FETCHERS, delays={})
+        # Two Wikipedia jobs, plus two attempts for each of the three WikiAves jobs
+        self.assertEqual(ran, 8)
+        self.assertEqual(queue_status(self.conn),
+                         {'wikiaves': {'failed': 3}, 'wikipedia': {'done': 2}})
+        errors = dict(self.conn.execute("SELECT name, error FROM jobs WHERE source = 'wikiaves'"))
+        self.assertEqual(errors['Alfa'], 'timed out')
+        self.assertEqual(errors['Gama'], 'no image found')
+
+    def test_workers_on_several_processes(self):
+        many = [BirdRecord(_bird(i, f'Ave{i}')) for i in range(40)]
+        enqueue_catalog(self.conn, many, 'wikipedia')
+        ran = run_workers(self.queue_path, processes=3, fetchers=FETCHERS, delays={})
+        self.assertEqual(ran, 40)
+        self.assertEqual(queue_status(self.conn), {'wikipedia': {'done': 40}})
+
+    def test_merge_writes_catalog(self):
+        enqueue_catalog(self.conn, self.birds, 'wikipedia')
+        run_worker(self.queue_path, 'w1', fetchers=FETCHERS, delays={})
+        self.assertTrue(merge(self.queue_path, self.json_path))
+        with open(self.json_path, encoding='utf-8') as f:
+            birds = {b['name']: b for b in json.load(f)}
+        self.assertEqual(birds['Alfa']['imageUrl'], 'https://upload.wikimedia.org/wikipedia/commons/Alfa.jpg')
+        self.assertEqual(birds['Beta']['imageUrl'], 'https://upload.wikimedia.org/wikipedia/commons/Beta.jpg')
+        # Predefined URLs are applied as scrape-wiki-images does
+        self.assertEqual(birds['Tiê-sangue']['imageUrl'], DIRECT_URLS['Tiê-sangue'])
+
+    def test_merge_matches_scrape_wiki_images(self):
+        # Delta's lookup fails, so its Special:FilePath image gets the direct URL fallback
+        catalog = CATALOG + [_bird(5, 'Delta', image_url='https://pt.wikipedia.org/wiki/Special:FilePath/Delta.jpg')]
+        expected_path = os.path.join(self.tmp, 'expected.json')
+        for path in (self.json_path, expected_path):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(catalog, f, ensure_ascii=False)
+
+        enqueue_catalog(self.conn, [BirdRecord(b) for b in catalog], 'wikipedia')
+        run_worker(self.queue_path, 'w1', max_attempts=1, fetchers=FETCHERS, delays={})
+        self.assertEqual(queue_status(self.conn), {'wikipedia': {'done': 2, 'failed': 1}})
+        self.assertTrue(merge(self.queue_path, self.json_path))
+
+        with patch('scrape_wiki_images.get_wikipedia_image_url', side_effect=fake_wikipedia):
+            self.assertTrue(fix_bird_data_json(expected_path))
+        with open(self.json_path, encoding='utf-8') as f, open(expected_path, encoding='utf-8') as g:
+            self.assertEqual(json.load(f), json.load(g))
+
+    def test_merge_missing_catalog(self):
+        self.assertFalse(merge(self.queue_path, os.path.join(self.tmp, 'nao_existe.json')))
+
+
+if __name__ == '__main__':
+    unittest.main()
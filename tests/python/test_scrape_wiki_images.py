@@ -6,6 +6,7 @@ import unittest
 from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from catalog_fixture import write_catalog
 from scrape_wiki_images import DIRECT_URLS, fix_bird_data_json, get_wikipedia_image_url
 
 INFOBOX_HTML = """<html><body>
@@ -92,8 +93,7 @@ class TestFixBirdDataJson(unittest.TestCase):
             os.unlink(self.path)
 
     def _write(self, data):
-        with open(self.path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False)
+        write_catalog(self.path, data)
 
     def _read(self):
         with open(self.path, encoding='utf-8') as f:
@@ -101,7 +101,7 @@ class TestFixBirdDataJson(unittest.TestCase):
 
     def test_applies_direct_url_for_known_bird(self):
         name = next(iter(DIRECT_URLS))
-        self._write([{'name': name, 'imageUrl': '', 'wikipediaUrl': ''}])
+        self._write([{'name': name, 'imageUrl': ''}])
         fix_bird_data_json(self.path)
         self.assertEqual(self._read()[0]['imageUrl'], DIRECT_URLS[name])
 
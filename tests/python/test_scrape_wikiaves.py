@@ -1,10 +1,16 @@
+import json
 import os
+import shutil
 import sys
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 
+import openpyxl
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
-from scrape_wikiaves import get_wikiaves_image_url
+from catalog_fixture import write_catalog
+from scrape_wikiaves import get_wikiaves_image_url, update_bird_data_from_wikiaves
 
 
 def _resp(html='', status=200):
@@ -64,5 +70,50 @@ class TestGetWikiavesImageUrl(unittest.TestCase):
         self.assertIsNone(get_wikiaves_image_url('https://wikiaves.com.br/wiki/saira'))
 
 
+@patch('scrape_wikiaves.time.sleep')
+class TestUpdateBirdDataFromWikiaves(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.assets = os.path.join(self.tmpdir, 'attached_assets')
+        os.makedirs(self.assets)
+        self.json_path = os.path.join(self.tmpdir, 'bird_data.json')
+        self.merged_path = os.path.join(self.tmpdir, 'merged_source.json')
+        write_catalog(self.json_path, [
+            {'name': 'Saíra-sete-cores', 'scientificName': 'Tangara seledon', 'imageUrl': 'https://old.jpg'},
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _write_workbook(self, name, rows):
+        workbook = openpyxl.Workbook()
+        workbook.active.append(['Nome Comum', 'Espécie', 'link'])
+        for row in rows:
+            workbook.active.append(row)
+        workbook.save(os.path.join(self.assets, name))
+
+    def _run(self):
+        return update_bird_data_from_wikiaves(self.assets, self.json_path, self.merged_path)
+
+    def test_uses_link_of_newest_workbook(self, _sleep):
+        self._write_workbook('aves_Toca_v2.xlsx', [
+            ['Saíra-sete-cores', 'Tangara seledon', 'https://www.wikiaves.com.br/wiki/old'],
+            # Not in the catalog, so never fetched
+            ['Saí-azul', 'Dacnis cayana', 'https://www.wikiaves.com.br/wiki/sai-azul'],
+        ])
+        self._write_workbook('birds_1777765095634.xlsx', [
+            ['Saíra-sete-cores', 'Tangara seledon', 'https://www.wikiaves.com.br/wiki/saira-sete-cores'],
+        ])
+        with patch('scrape_wikiaves.get_wikiaves_image_url', return_value='https://img/saira.jpg') as mock_get:
+            self.assertTrue(self._run())
+        mock_get.assert_called_once_with('https://www.wikiaves.com.br/wiki/saira-sete-cores')
+        with open(self.json_path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)[0]['imageUrl'], 'https://img/saira.jpg')
+
+    def test_returns_false_when_no_workbooks(self, _sleep):
+        self.assertFalse(self._run())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,93 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from search_index import build_index, build_search_index, fold, search, stem, tokenize
+
+BIRDS = [
+    {'id': 1, 'name': 'Saí-azul', 'description': 'Vive aos pares.',
+     'behavior': None, 'habitat': 'Matas ciliares.', 'diet': 'Frutos e néctar.'},
+    {'id': 2, 'name': 'Socó-boi', 'description': 'Ave grande.',
+     'behavior': 'Solitário.', 'habitat': 'Margens de rios.', 'diet': 'Peixes.'},
+    {'id': 3, 'name': 'Beija-flor', 'description': 'Néctar, néctar e néctar.',
+     'behavior': 'Visita flores.', 'habitat': 'Mata.', 'diet': 'Néctar.'},
+]
+
+
+class TestTokenize(unittest.TestCase):
+
+    def test_fold_strips_accents(self):
+        self.assertEqual(fold('Néctar SÃO Pássaro'), 'nectar sao passaro')
+
+    def test_stem_singularizes(self):
+        self.assertEqual(stem('ciliares'), stem('ciliar'))
+        self.assertEqual(stem('matas'), stem('mata'))
+        self.assertEqual(stem('flores'), stem('flor'))
+        self.assertEqual(stem(fold('canções')), stem(fold('canção')))
+        self.assertEqual(stem('pares'), 'par')
+
+    def test_short_words_untouched(self):
+        self.assertEqual(stem('par'), 'par')
+
+    def test_stop_words_removed(self):
+        self.assertEqual(tokenize('Frutos e néctar de flores'), ['frut', 'nectar', 'flor'])
+
+    def test_empty_text(self):
+        self.assertEqual(tokenize(None), [])
+        self.assertEqual(tokenize(''), [])
+
+
+class TestSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.index = build_index(BIRDS)
+
+    def test_accent_insensitive_lookup(self):
+        self.assertEqual({i for i, _ in search(self.index, 'nectar')}, {1, 3})
+
+    def test_more_occurrences_rank_higher(self):
+        self.assertEqual(search(self.index, 'néctar')[0][0], 3)
+
+    def test_inflected_query_matches(self):
+        self.assertEqual([i for i, _ in search(self.index, 'mata ciliar')][0], 1)
+        self.assertEqual([i for i, _ in search(self.index, 'par')], [1])
+
+    def test_no_match(self):
+        self.assertEqual(search(self.index, 'pinguim'), [])
+
+    def test_postings_sorted_by_score(self):
+        scores = [s for _, s in self.index['postings']['nectar']]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_empty_catalog(self):
+        index = build_index([])
+        self.assertEqual(index['docCount'], 0)
+        self.assertEqual(search(index, 'nectar'), [])
+
+
+class TestBuildSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.json_path = os.path.join(self.tmpdir, 'bird_data.json')
+        with open(self.json_path, 'w', encoding='utf-8') as f:
+            json.dump(BIRDS, f, ensure_ascii=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_writes_index_next_to_catalog(self):
+        index = build_search_index(self.json_path)
+        with open(os.path.join(self.tmpdir, 'bird_search_index.json'), encoding='utf-8') as f:
+            self.assertEqual(json.load(f), index)
+
+    def test_returns_none_on_missing_file(self):
+        self.assertIsNone(build_search_index(os.path.join(self.tmpdir, 'nao_existe.json')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+sys.path.insert(0, REPO_ROOT)
+from sightings_report import (
+    cache_image, cache_images, format_date_pt, load_visitor_birds, render_cards,
+    render_report_html, render_reports,
+)
+
+CATALOG = [
+    {'id': 1, 'name': 'Saíra-sete-cores', 'scientificName': 'Tangara seledon',
+     'description': 'Sete cores <vivas>', 'behavior': 'Bandos mistos', 'habitat': 'Mata Atlântica',
+     'diet': 'Frutos', 'imageUrl': '/birds/bird-1.jpg'},
+    {'id': 2, 'name': 'Tiê-sangue', 'scientificName': 'Ramphocelus bresilia',
+     'description': 'Vermelho', 'habitat': 'Bordas', 'diet': 'Frutos',
+     'imageUrl': '/birds/bird-2.jpg', 'customImageUrl': '//upload.example.org/tie.jpg'},
+    {'id': 3, 'name': 'Beija-flor-tesoura', 'scientificName': 'Eupetomena macroura',
+     'description': 'Cauda longa', 'habitat': 'Jardins', 'diet': 'Néctar',
+     'imageUrl': '/birds/bird-missing.jpg'},
+]
+
+
+def fake_pdf(report_html, output_path):
+    # Stands in for wkhtmltopdf; also runs in forked pool workers
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(report_html)
+
+
+class TestRendering(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.public = os.path.join(self.tmp, 'public')
+        os.makedirs(os.path.join(self.public, 'birds'))
+        with open(os.path.join(self.public, 'birds', 'bird-1.jpg'), 'wb') as f:
+            f.write(b'jpg')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_format_date_pt(self):
+        self.assertEqual(format_date_pt(date(2025, 3, 7)), '07 de março de 2025')
+
+    def test_local_image_and_missing_image(self):
+        self.assertTrue(cache_image('/birds/bird-1.jpg', self.tmp, self.public).startswith('file:'))
+        self.assertIsNone(cache_image('/birds/bird-missing.jpg', self.tmp, self.public))
+        self.assertIsNone(cache_image('', self.tmp, self.public))
+
+    @patch('sightings_report.requests.get')
+    def test_remote_image_downloaded_once(self, mock_get):
+        mock_get.return_value = MagicMock(content=b'img')
+        cache_dir = os.path.join(self.tmp, 'cache')
+        first = cache_image('https://upload.example.org/tie.jpg', cache_dir, self.public)
+        second = cache_image('https://upload.example.org/tie.jpg', cache_dir, self.public)
+        self.assertEqual(first, second)
+        self.assertTrue(first.endswith('.jpg'))
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('sightings_report.requests.get', side_effect=Exception('offline'))
+    def test_cards(self, mock_get):
+        images = cache_images(CATALOG, os.path.join(self.tmp, 'cache'), self.public)
+        # Protocol-relative custom images win over imageUrl, as in the browser
+        self.assertIn('https://upload.example.org/tie.jpg', images)
+        cards = render_cards(CATALOG, images)
+        self.assertIn('<img src="file:', cards[1])
+        self.assertIn('Sete cores &lt;vivas&gt;', cards[1])
+        self.assertIn('Comportamento', cards[1])
+        self.assertNotIn('Comportamento', cards[2])
+        self.assertNotIn('<img', cards[3])
+
+    def test_report_html(self):
+        cards = {1: '<div>um</div>', 2: '<div>dois</div>', 3: '<div>três</div>'}
+        report = render_report_html(cards, [3, 1, 99, 2], date(2025, 10, 1))
+        self.assertIn('3 espécies registradas · 01 de outubro de 2025', report)
+        self.assertEqual(report.count('<tr>'), 3)  # header row and two card rows
+        self.assertLess(report.index('três'), report.index('um'))
+        self.assertIn('1 espécie registrada', render_report_html(cards, [1], date(2025, 10, 1)))
+
+
+class TestRenderReports(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.json_path = os.path.join(self.tmp, 'bird_data.json')
+        with open(self.json_path, 'w', encoding='utf-8') as f:
+            json.dump(CATALOG, f, ensure_ascii=False)
+        self.source = os.path.join(self.tmp, 'export.sqlite')
+        conn = sqlite3.connect(self.source)
+        conn.execute("CREATE TABLE bird_sightings (id INTEGER PRIMARY KEY, user_id INTEGER, bird_id INTEGER)")
+        conn.executemany("INSERT INTO bird_sightings VALUES (?,?,?)",
+                         [(1, 10, 2), (2, 10, 1), (3, 11, 3), (4, 10, 2), (5, 12, 1)])
+        conn.commit()
+        conn.close()
+        self.output = os.path.join(self.tmp, 'reports')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_load_visitor_birds(self):
+        self.assertEqual(load_visitor_birds(self.source), {10: [2, 1], 11: [3], 12: [1]})
+
+    def _render(self, workers):
+        with patch('sightings_report.html_to_pdf', side_effect=fake_pdf), \
+             patch('sightings_report.requests.get', side_effect=Exception('offline')):
+            self.assertTrue(render_reports(self.source, self.output, self.json_path, workers,
+                                           os.path.join(self.tmp, 'cache'), self.tmp, date(2025, 10, 1)))
+        return sorted(os.listdir(self.output))
+
+    def test_render_inline(self):
+        self.assertEqual(self._render(1),
+                         ['aves-vistas-10.pdf', 'aves-vistas-11.pdf', 'aves-vistas-12.pdf'])
+        with open(os.path.join(self.output, 'aves-vistas-10.pdf'), encoding='utf-8') as f:
+            self.assertIn('2 espécies registradas', f.read())
+
+    def test_render_on_process_pool(self):
+        self.assertEqual(len(self._render(2)), 3)
+
+    def test_failed_report_is_reported(self):
+        with patch('sightings_report.html_to_pdf', side_effect=OSError('wkhtmltopdf not found')), \
+             patch('sightings_report.requests.get', side_effect=Exception('offline')):
+            self.assertFalse(render_reports(self.source, self.output, self.json_path, 1,
+                                            os.path.join(self.tmp, 'cache'), self.tmp))
+
+
+class _ImageHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        body = self.path.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+# Runs in a fresh interpreter, where requests has not been loaded yet
+CACHE_IMAGES = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from sightings_report import cache_images
+birds = [{'imageUrl': f'{sys.argv[2]}/bird-{i}.jpg'} for i in range(10)]
+images = cache_images(birds, sys.argv[3], sys.argv[3])
+print(sum(uri is not None for uri in images.values()))
+"""
+
+
+class TestCacheImagesFreshProcess(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _ImageHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmp)
+
+    def test_cold_cache_downloads_every_image(self):
+        base = f'http://127.0.0.1:{self.server.server_port}'
+        out = subprocess.run([sys.executable, '-c', CACHE_IMAGES, REPO_ROOT, base, self.tmp],
+                             capture_output=True, text=True, check=True).stdout
+        self.assertNotIn('Error downloading', out)
+        self.assertEqual(out.splitlines()[-1], '10')
+        self.assertEqual(len(os.listdir(self.tmp)), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
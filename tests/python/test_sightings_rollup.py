@@ -0,0 +1,203 @@
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from sightings_rollup import (
+    available_years, monthly_for_selection, open_rollups, sightings_by_bird,
+    sightings_by_family, sightings_by_month, update_rollups,
+)
+
+CATALOG = [
+    {'id': 1, 'name': 'Saíra-sete-cores', 'scientificName': 'Tangara seledon', 'family': 'Thraupidae',
+     'imageUrl': '/birds/bird-1.jpg'},
+    {'id': 2, 'name': 'Tiê-sangue', 'scientificName': 'Ramphocelus bresilia', 'family': 'Thraupidae',
+     'imageUrl': '/birds/bird-2.jpg', 'customImageUrl': '/uploads/tie.jpg'},
+    {'id': 3, 'name': 'Beija-flor-tesoura', 'scientificName': 'Eupetomena macroura', 'family': 'Trochilidae',
+     'imageUrl': '/birds/bird-3.jpg'},
+]
+
+TOCA = (-23.78, -45.36)
+FAR = (-23.0, -46.5)
+
+# id, bird_id, bird_name, timestamp, (lat, lon), season
+RECORDS = [
+    (1, 1, 'Saíra-sete-cores', '2024-01-10 09:00:00', TOCA, 'summer'),
+    (2, 1, 'Saíra-sete-cores', '2024-01-10 10:30:00', TOCA, 'summer'),
+    (3, 2, 'Tiê-sangue', '2024-07-02 08:00:00', FAR, 'winter'),
+    (4, 3, 'Beija-flor-tesoura', '2025-03-15 16:00:00', TOCA, 'autumn'),
+    (5, 0, 'Desconhecida', '2023-05-01 12:00:00', TOCA, 'autumn'),
+    # A different environment's id for a catalog bird is matched by name
+    (6, 42, 'Tiê-sangue', '2025-03-20 07:00:00', (None, None), 'autumn'),
+]
+
+NEW_RECORDS = [
+    (7, 1, 'Saíra-sete-cores', '2025-03-21 11:00:00', TOCA, 'autumn'),
+    (8, 1, 'Saíra-sete-cores', '2025-03-22 11:00:00', FAR, 'autumn'),
+    (9, 3, 'Beija-flor-tesoura', '2025-12-01 06:00:00', TOCA, 'summer'),
+]
+
+
+def _insert(path, records):
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sighting_records (
+            id INTEGER PRIMARY KEY, bird_id INTEGER, bird_name TEXT, timestamp TEXT,
+            latitude REAL, longitude REAL, season TEXT
+        )""")
+    conn.executemany("INSERT INTO sighting_records VALUES (?,?,?,?,?,?,?)",
+                     [(i, b, n, ts, lat, lon, s) for i, b, n, ts, (lat, lon), s in records])
+    conn.commit()
+    conn.close()
+
+
+class TestSightingsRollup(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.source = os.path.join(self.tmp, 'export.sqlite')
+        self.rollup = os.path.join(self.tmp, 'rollup.sqlite')
+        self.json_path = os.path.join(self.tmp, 'bird_data.json')
+        with open(self.json_path, 'w', encoding='utf-8') as f:
+            json.dump(CATALOG, f, ensure_ascii=False)
+        _insert(self.source, RECORDS)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _update(self, rollup=None):
+        self.assertTrue(update_rollups(self.source, rollup or self.rollup, self.json_path))
+        return open_rollups(rollup or self.rollup)
+
+    def test_by_month(self):
+        conn = self._update()
+        rows = sorted(sightings_by_month(conn), key=lambda r: (r['monthKey'], r['birdName']))
+        self.assertEqual(rows, [
+            {'monthKey': '2024-01', 'birdName': 'Saíra-sete-cores', 'count': 2},
+            {'monthKey': '2024-07', 'birdName': 'Tiê-sangue', 'count': 1},
+            {'monthKey': '2025-03', 'birdName': 'Beija-flor-tesoura', 'count': 1},
+            {'monthKey': '2025-03', 'birdName': 'Tiê-sangue', 'count': 1},
+        ])
+        self.assertEqual(len(sightings_by_month(conn, season='autumn', geo_only=True)), 1)
+        conn.close()
+
+    def test_by_bird_filters(self):
+        conn = self._update()
+        self.assertEqual(sightings_by_bird(conn), [
+            {'birdId': 1, 'birdName': 'Saíra-sete-cores', 'count': 2},
+            {'birdId': 2, 'birdName': 'Tiê-sangue', 'count': 2},
+            {'birdId': 3, 'birdName': 'Beija-flor-tesoura', 'count': 1},
+        ])
+        self.assertEqual([r['birdName'] for r in sightings_by_bird(conn, year=2025, season='autumn')],
+                         ['Beija-flor-tesoura', 'Tiê-sangue'])
+        self.assertEqual(sightings_by_bird(conn, geo_only=True, year=2024),
+                         [{'birdId': 1, 'birdName': 'Saíra-sete-cores', 'count': 2}])
+        conn.close()
+
+    def test_relative_period_is_summed_from_daily_counts(self):
+        conn = self._update()
+        rows = sightings_by_bird(conn, period='last1month', today=date(2025, 4, 1))
+        self.assertEqual(rows, [
+            {'birdId': 3, 'birdName': 'Beija-flor-tesoura', 'count': 1},
+            {'birdId': 42, 'birdName': 'Tiê-sangue', 'count': 1},
+        ])
+        # With a year, the window ends on December 31 of that year
+        self.assertEqual(sightings_by_bird(conn, year=2024, period='last1year'),
+                         [{'birdId': 1, 'birdName': 'Saíra-sete-cores', 'count': 2},
+                          {'birdId': 2, 'birdName': 'Tiê-sangue', 'count': 1}])
+        conn.close()
+
+    def test_relative_period_cut_day_with_year(self):
+        # The server's last1month for 2025 starts at 2025-12-01 23:59:59, dropping that morning
+        _insert(self.source, NEW_RECORDS)
+        conn = self._update()
+        self.assertEqual(sightings_by_bird(conn, year=2025, period='last1month'), [])
+        self.assertEqual(sightings_by_bird(conn, year=2025, period='last3months'),
+                         [{'birdId': 3, 'birdName': 'Beija-flor-tesoura', 'count': 1}])
+        conn.close()
+
+    def test_relative_period_stays_within_year(self):
+        # 365 days before 2025-12-31 is 2024-12-31, which belongs to the previous year
+        _insert(self.source, [(10, 2, 'Tiê-sangue', '2024-12-31 18:00:00', TOCA, 'summer')])
+        conn = self._update()
+        self.assertEqual(sightings_by_bird(conn, year=2025, period='last1year'), [
+            {'birdId': 3, 'birdName': 'Beija-flor-tesoura', 'count': 1},
+            {'birdId': 42, 'birdName': 'Tiê-sangue', 'count': 1},
+        ])
+        conn.close()
+
+    def test_by_family(self):
+        conn = self._update()
+        families = sightings_by_family(conn)
+        self.assertEqual([(f['family'], f['count']) for f in families],
+                         [('Thraupidae', 4), ('Trochilidae', 1)])
+        tie = next(b for b in families[0]['birds'] if b['birdName'] == 'Tiê-sangue')
+        self.assertEqual(tie['imageUrl'], '/uploads/tie.jpg')
+        self.assertEqual(tie['scientificName'], 'Ramphocelus bresilia')
+
+        period = sightings_by_family(conn, period='last1month', catalog=CATALOG, today=date(2025, 4, 1))
+        self.assertEqual([(f['family'], f['count']) for f in period],
+                         [('Trochilidae', 1), ('Thraupidae', 1)])
+        self.assertEqual(period[1]['birds'][0]['birdId'], 2)
+        conn.close()
+
+    def test_monthly_and_years(self):
+        conn = self._update()
+        monthly = monthly_for_selection(conn, family='Thraupidae')
+        self.assertEqual(len(monthly), 12)
+        self.assertEqual({m['month']: m['count'] for m in monthly if m['count']}, {1: 2, 3: 1, 7: 1})
+        self.assertEqual(monthly_for_selection(conn, bird_id=1, year=2025)[0], {'month': 1, 'count': 0})
+        self.assertEqual(sum(m['count'] for m in monthly_for_selection(conn, geo_only=True)), 3)
+        # Years include records without a catalog bird, as the server does
+        self.assertEqual(available_years(conn), [2025, 2024, 2023])
+        conn.close()
+
+    def test_family_series_counts_name_or_id_membership(self):
+        # Named as a Thraupidae bird but carrying a Trochilidae id, so the server counts it for both
+        _insert(self.source, [(10, 3, 'Tiê-sangue', '2025-06-10 09:00:00', TOCA, 'winter')])
+        conn = self._update()
+        thraupidae = monthly_for_selection(conn, family='Thraupidae', year=2025)
+        trochilidae = monthly_for_selection(conn, family='Trochilidae', year=2025)
+        self.assertEqual({m['month']: m['count'] for m in thraupidae if m['count']}, {3: 1, 6: 1})
+        self.assertEqual({m['month']: m['count'] for m in trochilidae if m['count']}, {3: 1, 6: 1})
+        # Birds without a catalog family are not a family of their own here
+        self.assertEqual(sum(m['count'] for m in monthly_for_selection(conn, family='Outras')), 0)
+        conn.close()
+
+    def test_incremental_update_matches_full_rebuild(self):
+        self._update().close()
+        _insert(self.source, NEW_RECORDS)
+        incremental = self._update()
+
+        full_path = os.path.join(self.tmp, 'full.sqlite')
+        full = self._update(full_path)
+
+        for query in (sightings_by_month, sightings_by_bird, sightings_by_family, available_years):
+            self.assertEqual(query(incremental), query(full), query.__name__)
+        self.assertEqual(monthly_for_selection(incremental, bird_id=1, season='autumn'),
+                         monthly_for_selection(full, bird_id=1, season='autumn'))
+        self.assertEqual(sightings_by_bird(incremental)[0],
+                         {'birdId': 1, 'birdName': 'Saíra-sete-cores', 'count': 4})
+        incremental.close()
+        full.close()
+
+    def test_no_new_records_keeps_tables(self):
+        self._update().close()
+        conn = self._update()
+        self.assertEqual(conn.execute("SELECT last_id FROM rollup_state").fetchone()[0], 6)
+        self.assertEqual(len(sightings_by_bird(conn)), 3)
+        conn.close()
+
+    def test_missing_source_table(self):
+        os.unlink(self.source)
+        sqlite3.connect(self.source).close()
+        self.assertFalse(update_rollups(self.source, self.rollup, self.json_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
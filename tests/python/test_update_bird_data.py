@@ -4,13 +4,27 @@ import shutil
 import sys
 import tempfile
 import unittest
-from unittest.mock import patch
+
+import openpyxl
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 import update_bird_data
+from catalog_fixture import write_catalog
 
-EXCEL_PATH = "attached_assets/aves_Toca_v2 (1).xlsx"
+ASSETS_DIR = "attached_assets"
 JSON_PATH = "bird_data.json"
+MERGED_PATH = "merged_source.json"
+
+
+def _write_workbook(name, rows, mtime=None):
+    workbook = openpyxl.Workbook()
+    workbook.active.append(['Nome Comum', 'Espécie', 'Picture'])
+    for row in rows:
+        workbook.active.append(row)
+    path = os.path.join(ASSETS_DIR, name)
+    workbook.save(path)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
 
 
 class TestUpdateBirdDataFromExcel(unittest.TestCase):
@@ -19,78 +33,81 @@ class TestUpdateBirdDataFromExcel(unittest.TestCase):
         self.old_cwd = os.getcwd()
         self.tmpdir = tempfile.mkdtemp()
         os.chdir(self.tmpdir)
-        os.makedirs('attached_assets', exist_ok=True)
+        os.makedirs(ASSETS_DIR, exist_ok=True)
 
     def tearDown(self):
         os.chdir(self.old_cwd)
         shutil.rmtree(self.tmpdir, ignore_errors=True)
 
     def _write_json(self, data):
-        with open(JSON_PATH, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False)
+        write_catalog(JSON_PATH, data)
 
     def _read_json(self):
         with open(JSON_PATH, encoding='utf-8') as f:
             return json.load(f)
 
-    def test_returns_early_when_excel_missing(self):
-        # Não deve levantar exceção
-        update_bird_data.update_bird_data_from_excel()
+    def test_returns_false_when_no_workbooks(self):
+        self._write_json([{'name': 'Saíra-sete-cores', 'imageUrl': 'https://old.jpg'}])
+        self.assertFalse(update_bird_data.update_bird_data_from_excel())
 
-    def test_returns_early_when_json_missing(self):
-        open(EXCEL_PATH, 'w').close()
-        update_bird_data.update_bird_data_from_excel()
+    def test_returns_false_when_json_missing(self):
+        _write_workbook('aves_Toca_v2.xlsx', [])
+        self.assertFalse(update_bird_data.update_bird_data_from_excel())
 
-    @patch('update_bird_data.pd.read_excel')
-    def test_updates_bird_url_from_excel(self, mock_excel):
-        import pandas as pd
-        self._write_json([{'name': 'Saíra-sete-cores', 'imageUrl': 'https://old.jpg'}])
-        open(EXCEL_PATH, 'w').close()
-        mock_excel.return_value = pd.DataFrame({
-            'Nome Comum': ['Saíra-sete-cores'],
-            'Picture': ['https://new.jpg'],
-        })
-        update_bird_data.update_bird_data_from_excel()
+    def test_updates_bird_url_from_workbook(self):
+        self._write_json([{'name': 'Saíra-sete-cores', 'scientificName': 'Tangara seledon',
+                           'imageUrl': 'https://old.jpg'}])
+        _write_workbook('aves_Toca_v2.xlsx', [['Saíra-sete-cores', 'Tangara seledon', 'https://new.jpg']])
+        self.assertTrue(update_bird_data.update_bird_data_from_excel())
         self.assertEqual(self._read_json()[0]['imageUrl'], 'https://new.jpg')
+        # The merged table is written for the next run
+        self.assertTrue(os.path.exists(MERGED_PATH))
+
+    def test_newest_workbook_wins(self):
+        self._write_json([{'name': 'Saíra-sete-cores', 'scientificName': 'Tangara seledon',
+                           'imageUrl': 'https://old.jpg'}])
+        # The two Toca workbooks disagreed; a dated snapshot outranks both
+        _write_workbook('aves_Toca_v2.xlsx', [['Saíra-sete-cores', 'Tangara seledon', 'https://a.jpg']])
+        _write_workbook('aves_Toca_v2 (1).xlsx', [['Saíra-sete-cores', 'Tangara seledon', 'https://b.jpg']])
+        _write_workbook('birds_1777765095634.xlsx', [['Saíra-sete-cores', 'Tangara seledon', 'https://c.jpg']])
+        self.assertTrue(update_bird_data.update_bird_data_from_excel())
+        self.assertEqual(self._read_json()[0]['imageUrl'], 'https://c.jpg')
+
+    def test_stale_merged_table_is_rebuilt(self):
+        self._write_json([{'name': 'Saíra-sete-cores', 'scientificName': 'Tangara seledon',
+                           'imageUrl': 'https://old.jpg'}])
+        _write_workbook('birds_1000000000000.xlsx', [['Saíra-sete-cores', 'Tangara seledon', 'https://a.jpg']],
+                        mtime=1000)
+        update_bird_data.update_bird_data_from_excel()
+        os.utime(MERGED_PATH, (2000, 2000))
+        _write_workbook('birds_2000000000000.xlsx', [['Saíra-sete-cores', 'Tangara seledon', 'https://b.jpg']],
+                        mtime=3000)
+        update_bird_data.update_bird_data_from_excel()
+        self.assertEqual(self._read_json()[0]['imageUrl'], 'https://b.jpg')
 
-    @patch('update_bird_data.pd.read_excel')
-    def test_does_not_update_when_url_unchanged(self, mock_excel):
-        import pandas as pd
+    def test_does_not_update_when_url_unchanged(self):
         url = 'https://same.jpg'
-        self._write_json([{'name': 'Saíra-sete-cores', 'imageUrl': url}])
-        open(EXCEL_PATH, 'w').close()
-        mock_excel.return_value = pd.DataFrame({
-            'Nome Comum': ['Saíra-sete-cores'],
-            'Picture': [url],
-        })
+        self._write_json([{'name': 'Saíra-sete-cores', 'scientificName': 'Tangara seledon', 'imageUrl': url}])
+        _write_workbook('aves_Toca_v2.xlsx', [['Saíra-sete-cores', 'Tangara seledon', url]])
         update_bird_data.update_bird_data_from_excel()
         self.assertEqual(self._read_json()[0]['imageUrl'], url)
 
-    @patch('update_bird_data.pd.read_excel')
-    def test_skips_bird_not_in_excel(self, mock_excel):
-        import pandas as pd
+    def test_skips_bird_not_in_workbooks(self):
         original = 'https://unchanged.jpg'
-        self._write_json([{'name': 'Desconhecido', 'imageUrl': original}])
-        open(EXCEL_PATH, 'w').close()
-        mock_excel.return_value = pd.DataFrame({
-            'Nome Comum': ['Outro Pássaro'],
-            'Picture': ['https://other.jpg'],
-        })
+        self._write_json([{'name': 'Desconhecido', 'scientificName': 'Avis ignota', 'imageUrl': original}])
+        _write_workbook('aves_Toca_v2.xlsx', [['Outro Pássaro', 'Avis alia', 'https://other.jpg']])
         update_bird_data.update_bird_data_from_excel()
         self.assertEqual(self._read_json()[0]['imageUrl'], original)
 
-    @patch('update_bird_data.pd.read_excel')
-    def test_multiple_birds_updated_correctly(self, mock_excel):
-        import pandas as pd
+    def test_multiple_birds_updated_correctly(self):
         self._write_json([
-            {'name': 'Ave A', 'imageUrl': 'https://old-a.jpg'},
-            {'name': 'Ave B', 'imageUrl': 'https://old-b.jpg'},
+            {'name': 'Ave A', 'scientificName': 'Avis a', 'imageUrl': 'https://old-a.jpg'},
+            {'name': 'Ave B', 'scientificName': 'Avis b', 'imageUrl': 'https://old-b.jpg'},
+        ])
+        _write_workbook('aves_Toca_v2.xlsx', [
+            ['Ave A', 'Avis a', 'https://new-a.jpg'],
+            ['Ave B', 'Avis b', 'https://new-b.jpg'],
         ])
-        open(EXCEL_PATH, 'w').close()
-        mock_excel.return_value = pd.DataFrame({
-            'Nome Comum': ['Ave A', 'Ave B'],
-            'Picture': ['https://new-a.jpg', 'https://new-b.jpg'],
-        })
         update_bird_data.update_bird_data_from_excel()
         result = self._read_json()
         self.assertEqual(result[0]['imageUrl'], 'https://new-a.jpg')
@@ -0,0 +1,144 @@
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from validate_catalog import (
+    CatalogValidationError, check_catalog, validate_catalog, validate_catalog_file,
+)
+
+
+def _bird(bird_id=1, name='Saí-azul', **overrides):
+    bird = {
+        'id': bird_id,
+        'name': name,
+        'scientificName': 'Dacnis cayana',
+        'family': 'Thraupidae',
+        'description': 'Tamanho: 13 cm. Peso: 16 g.',
+        'identification': None,
+        'sexualDimorphism': 'Sim',
+        'behavior': 'Vive aos pares.',
+        'habitat': 'Matas ciliares.',
+        'diet': 'Frutos e néctar.',
+        'sizeLength': '13',
+        'weightG': '16',
+        'wikipediaUrl': 'https://pt.wikipedia.org/wiki/Dacnis_cayana',
+        'wikiavesUrl': 'https://www.wikiaves.com.br/wiki/sai-azul',
+        'imageUrl': '/birds/bird-1.jpg',
+        'customImageUrl': None,
+    }
+    bird.update(overrides)
+    return bird
+
+
+def _problems(birds):
+    return [(e['index'], e['field'], e['message']) for e in validate_catalog(birds)]
+
+
+class TestValidateCatalog(unittest.TestCase):
+
+    def test_valid_catalog_has_no_errors(self):
+        self.assertEqual(validate_catalog([_bird(1), _bird(2, 'Saí-verde')]), [])
+
+    def test_empty_catalog_is_valid(self):
+        self.assertEqual(validate_catalog([]), [])
+
+    def test_repository_catalog_is_valid(self):
+        path = os.path.join(os.path.dirname(__file__), '..', '..', 'bird_data.json')
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(validate_catalog(json.load(f)), [])
+
+    def test_required_fields(self):
+        bird = _bird(habitat=None, diet='  ')
+        del bird['description']
+        self.assertEqual(_problems([bird]), [
+            (0, 'description', 'is required'),
+            (0, 'habitat', 'is required'),
+            (0, 'diet', 'is required'),
+        ])
+
+    def test_types(self):
+        self.assertEqual(_problems([_bird(bird_id='1', weightG=16, identification=['x'])]), [
+            (0, 'id', 'must be an integer'),
+            (0, 'identification', 'must be a string'),
+            (0, 'weightG', 'must be a string'),
+        ])
+
+    def test_url_shape(self):
+        problems = _problems([_bird(
+            imageUrl='bird.jpg', wikipediaUrl='/wiki/Dacnis', wikiavesUrl='https://wikiaves com',
+        )])
+        self.assertEqual([p[1] for p in problems], ['imageUrl', 'wikipediaUrl', 'wikiavesUrl'])
+        self.assertTrue(all(p[2] == 'is not a valid URL' for p in problems))
+
+    def test_numeric_fields(self):
+        self.assertEqual(_problems([_bird(sizeLength='10,5-11,5', weightG='cerca de 16')]), [
+            (0, 'weightG', 'is not a number or range'),
+        ])
+
+    def test_optional_empty_string_rejected(self):
+        self.assertEqual(_problems([_bird(customImageUrl='')]), [
+            (0, 'customImageUrl', 'is empty; use null instead'),
+        ])
+
+    def test_duplicate_ids_and_names(self):
+        problems = _problems([_bird(1, 'Saí-azul'), _bird(1, 'saí-azul '), _bird(2, 'Saí-verde')])
+        self.assertEqual(problems, [
+            (0, 'id', 'is duplicated'),
+            (0, 'name', 'is duplicated'),
+            (1, 'id', 'is duplicated'),
+            (1, 'name', 'is duplicated'),
+        ])
+
+    def test_report_names_the_record(self):
+        with self.assertRaises(CatalogValidationError) as ctx:
+            check_catalog([_bird(7, 'Tiê-preto', diet=None)])
+        self.assertIn("record 0 (id=7, name='Tiê-preto'): diet is required", str(ctx.exception))
+        self.assertEqual(len(ctx.exception.errors), 1)
+
+    def test_large_catalog_is_fast(self):
+        birds = [_bird(i, f'Ave {i}') for i in range(20000)]
+        validate_catalog(birds[:1])
+        start = time.perf_counter()
+        self.assertEqual(validate_catalog(birds), [])
+        self.assertLess(time.perf_counter() - start, 2)
+
+
+class TestValidateCatalogFile(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.NamedTemporaryFile(
+            mode='w', suffix='.json', delete=False, encoding='utf-8'
+        )
+        self.path = tmp.name
+        tmp.close()
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _write(self, data):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def test_valid_file(self):
+        self._write([_bird()])
+        self.assertTrue(validate_catalog_file(self.path))
+
+    def test_invalid_file(self):
+        self._write([_bird(name=None)])
+        self.assertFalse(validate_catalog_file(self.path))
+
+    def test_not_a_list(self):
+        self._write({'birds': []})
+        self.assertFalse(validate_catalog_file(self.path))
+
+    def test_missing_file(self):
+        self.assertFalse(validate_catalog_file('/nao/existe/arquivo.json'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import openpyxl
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+from watch_catalog import CatalogWatcher
+
+HEADER = ['name', 'scientific_name', 'diet', 'image_url']
+
+
+def _bird(bird_id, name, scientific_name, diet):
+    return {
+        'id': bird_id, 'name': name, 'scientificName': scientific_name,
+        'description': 'Descrição', 'habitat': 'Matas', 'diet': diet,
+        'imageUrl': f'/birds/bird-{bird_id}.jpg',
+        'wikipediaUrl': 'https://pt.wikipedia.org/wiki/' + scientific_name.replace(' ', '_'),
+    }
+
+
+class TestCatalogWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.workbook = os.path.join(self.tmpdir, 'birds_1000000000000.xlsx')
+        self.json_path = os.path.join(self.tmpdir, 'bird_data.json')
+        self._write_workbook([['Saí-azul', 'Dacnis cayana', 'Frutos', 'https://new.jpg']], mtime=1000)
+        with open(self.json_path, 'w', encoding='utf-8') as f:
+            json.dump([
+                _bird(2, 'Saí-azul', 'Dacnis cayana', 'Frutos'),
+                _bird(3, 'Saí-verde', 'Chlorophanes spiza', 'Néctar'),
+            ], f, ensure_ascii=False)
+        self.watcher = CatalogWatcher(self.tmpdir, self.json_path, debounce=0.5)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _write_workbook(self, rows, mtime, header=HEADER):
+        workbook = openpyxl.Workbook()
+        workbook.active.append(header)
+        for row in rows:
+            workbook.active.append(row)
+        workbook.save(self.workbook)
+        os.utime(self.workbook, (mtime, mtime))
+
+    def _read(self):
+        with open(self.json_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_no_change_does_nothing(self):
+        self.assertIsNone(self.watcher.step(now=0))
+        self.assertIsNone(self.watcher.step(now=10))
+
+    def test_change_is_debounced_then_published(self):
+        self._write_workbook([['Saí-azul', 'Dacnis cayana', 'Insetos', 'https://new.jpg']], mtime=2000)
+        self.assertIsNone(self.watcher.step(now=0))
+        self.assertIsNone(self.watcher.step(now=0.2))
+        self.assertEqual(self._read()[0]['diet'], 'Frutos')
+        self.assertEqual(self.watcher.step(now=1), 1)
+        birds = self._read()
+        self.assertEqual(birds[0]['diet'], 'Insetos')
+        self.assertEqual(birds[0]['imageUrl'], '/birds/bird-2.jpg')
+        self.assertEqual(birds[1]['diet'], 'Néctar')
+
+    def test_burst_of_changes_rebuilds_once(self):
+        self._write_workbook([['Saí-azul', 'Dacnis cayana', 'Insetos', '']], mtime=2000)
+        self.watcher.step(now=0)
+        self._write_workbook([['Saí-azul', 'Dacnis cayana', 'Sementes', '']], mtime=3000)
+        self.assertIsNone(self.watcher.step(now=0.4))
+        self.assertIsNone(self.watcher.step(now=0.6))
+        self.assertEqual(self.watcher.step(now=1), 1)
+        self.assertEqual(self._read()[0]['diet'], 'Sementes')
+
+    def test_unchanged_values_do_not_republish(self):
+        before = os.stat(self.json_path).st_mtime_ns
+        self._write_workbook([['Saí-azul', 'Dacnis cayana', 'Frutos', 'https://other.jpg']], mtime=2000)
+        self.watcher.step(now=0)
+        self.assertEqual(self.watcher.step(now=1), 0)
+        self.assertEqual(os.stat(self.json_path).st_mtime_ns, before)
+
+    def test_invalid_catalog_is_not_published(self):
+        before = self._read()
+        self._write_workbook(
+            [['Saí-azul', 'Dacnis cayana', 'Frutos', 'wikipedia/Dacnis']], mtime=2000,
+            header=['name', 'scientific_name', 'diet', 'wikipedia_url'],
+        )
+        self.watcher.step(now=0)
+        self.assertEqual(self.watcher.step(now=1), 0)
+        self.assertEqual(self._read(), before)
+
+    def test_failed_publish_keeps_valid_changes(self):
+        header = ['name', 'scientific_name', 'diet', 'wikipedia_url']
+        self._write_workbook([
+            ['Saí-azul', 'Dacnis cayana', 'Insetos', 'https://pt.wikipedia.org/wiki/Dacnis_cayana'],
+            ['Saí-verde', 'Chlorophanes spiza', 'Néctar', 'wikipedia/Chlorophanes'],
+        ], mtime=2000, header=header)
+        self.watcher.step(now=0)
+        self.assertEqual(self.watcher.step(now=1), 0)
+
+        # Fixing only the invalid bird still publishes the other one
+        self._write_workbook([
+            ['Saí-azul', 'Dacnis cayana', 'Insetos', 'https://pt.wikipedia.org/wiki/Dacnis_cayana'],
+            ['Saí-verde', 'Chlorophanes spiza', 'Néctar', 'https://pt.wikipedia.org/wiki/Chlorophanes_spiza'],
+        ], mtime=3000, header=header)
+        self.watcher.step(now=2)
+        self.assertEqual(self.watcher.step(now=3), 1)
+        self.assertEqual(self._read()[0]['diet'], 'Insetos')
+
+    def test_unreadable_catalog_is_retried(self):
+        self._write_workbook([['Saí-azul', 'Dacnis cayana', 'Insetos', '']], mtime=2000)
+        os.rename(self.json_path, self.json_path + '.tmp')
+        self.watcher.step(now=0)
+        self.assertIsNone(self.watcher.step(now=1))
+        self.assertTrue(self.watcher.pending)
+
+        os.rename(self.json_path + '.tmp', self.json_path)
+        self.assertIsNone(self.watcher.step(now=1.25))
+        self.assertEqual(self.watcher.step(now=1.5), 1)
+        self.assertEqual(self._read()[0]['diet'], 'Insetos')
+
+    def test_unreadable_workbook_at_start_is_retried(self):
+        with open(self.workbook, 'wb') as f:
+            f.write(b'not a workbook')
+        watcher = CatalogWatcher(self.tmpdir, self.json_path, debounce=0.5)
+        self.assertEqual(watcher.pending, {self.workbook})
+        self.assertEqual(watcher.step(now=0), 0)
+        self.assertEqual(watcher.pending, {self.workbook})
+        # The retry waits for the debounce instead of running on every poll
+        with patch.object(watcher, 'rebuild', wraps=watcher.rebuild) as rebuild:
+            self.assertIsNone(watcher.step(now=0.25))
+            rebuild.assert_not_called()
+            self.assertEqual(watcher.step(now=0.5), 0)
+            rebuild.assert_called_once()
+        self.assertEqual(watcher.pending, {self.workbook})
+
+        self._write_workbook([['Saí-azul', 'Dacnis cayana', 'Insetos', '']], mtime=2000)
+        watcher.step(now=1)
+        self.assertEqual(watcher.step(now=2), 1)
+        self.assertEqual(watcher.pending, set())
+        self.assertEqual(self._read()[0]['diet'], 'Insetos')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,71 +1,58 @@
-import pandas as pd
-import json
 import os
 
-def update_bird_data_from_excel():
+from bird_record import load_birds
+from merge_workbooks import ASSETS_DIR, OUTPUT_PATH, load_merged_source, species_key
+from publish import publish_catalog
+
+JSON_PATH = "bird_data.json"
+
+def update_bird_data_from_excel(assets_dir=ASSETS_DIR, json_path=JSON_PATH, merged_path=OUTPUT_PATH):
     """
-    Update the bird data JSON with image URLs from the Excel file
+    Update the bird data JSON with the image URLs of the merged source workbooks
     """
-    print("Starting update of bird data from Excel file...")
-    
-    # Path to the Excel file and JSON file
-    excel_path = "attached_assets/aves_Toca_v2 (1).xlsx"
-    json_path = "bird_data.json"
-    
-    # Check if files exist
-    if not os.path.exists(excel_path):
-        print(f"Error: Excel file not found at {excel_path}")
-        return
+    print("Starting update of bird data from the source workbooks...")
     
     if not os.path.exists(json_path):
         print(f"Error: JSON file not found at {json_path}")
-        return
+        return False
     
     try:
-        # Read the Excel file
-        print(f"Reading Excel file from {excel_path}...")
-        df = pd.read_excel(excel_path)
+        # Newest value per species across every workbook in the assets directory
+        merged = load_merged_source(assets_dir, merged_path)
+        if merged is None:
+            return False
         
         # Load the existing JSON data
         print(f"Reading JSON file from {json_path}...")
-        with open(json_path, 'r', encoding='utf-8') as f:
-            bird_data = json.load(f)
-        
-        # Check available columns
-        print(f"Available columns in Excel: {df.columns.tolist()}")
+        bird_data = load_birds(json_path)
         
-        # Create a dictionary of names to image URLs from Excel
-        image_urls = {}
-        for _, row in df.iterrows():
-            name = row.get('Nome Comum', None)
-            if name and 'Picture' in df.columns and pd.notna(row['Picture']):
-                image_urls[name] = str(row['Picture'])
+        # Create a dictionary of species to image URLs from the merged table
+        image_urls = {record["key"]: record["imageUrl"] for record in merged if record.get("imageUrl")}
         
         print(f"Found {len(image_urls)} birds with image URLs")
         
         # Update the JSON data with new image URLs
         update_count = 0
         for bird in bird_data:
-            if bird['name'] in image_urls:
-                old_url = bird.get('imageUrl', '')
-                new_url = image_urls[bird['name']]
-                
-                # Only update if the URL is actually different and not empty
-                if old_url != new_url and new_url and not pd.isna(new_url):
-                    bird['imageUrl'] = new_url
-                    update_count += 1
-                    print(f"Updated {bird['name']} with image URL: {new_url}")
+            new_url = image_urls.get(species_key(bird))
+            
+            # Only update if the URL is actually different and not empty
+            if new_url and bird.get('imageUrl', '') != new_url:
+                bird.imageUrl = new_url
+                update_count += 1
+                print(f"Updated {bird.name} with image URL: {new_url}")
         
         print(f"Updated {update_count} birds with new image URLs")
         
-        # Save the updated JSON data
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(bird_data, f, ensure_ascii=False, indent=2)
+        # Validate the updated data and atomically replace the JSON file
+        publish_catalog(bird_data, json_path)
         
         print(f"Successfully updated JSON file at {json_path}")
+        return True
         
     except Exception as e:
         print(f"Error updating bird data: {str(e)}")
+        return False
 
 if __name__ == "__main__":
     update_bird_data_from_excel()
\ No newline at end of file
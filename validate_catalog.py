@@ -0,0 +1,146 @@
+from bird_record import load_birds
+from lazy_import import lazy_import
+
+pd = lazy_import('pandas')
+
+JSON_PATH = "bird_data.json"
+
+# Columns of the `birds` table in shared/schema.ts
+REQUIRED_FIELDS = [
+    "name", "scientificName", "description", "habitat", "diet", "imageUrl", "wikipediaUrl",
+]
+OPTIONAL_FIELDS = [
+    "family", "identification", "sexualDimorphism", "behavior", "sizeLength", "weightG",
+    "customImageUrl", "wikiavesUrl",
+]
+TEXT_FIELDS = REQUIRED_FIELDS + OPTIONAL_FIELDS
+
+# Images may be site-relative (e.g. /birds/bird-1.jpg); reference links must be absolute
+IMAGE_URL_PATTERN = r"(?:https?://|/)[^\s]+"
+WEB_URL_PATTERN = r"https?://[^\s/]+\.[^\s/]+(?:/[^\s]*)?"
+URL_FIELDS = {
+    "imageUrl": IMAGE_URL_PATTERN,
+    "customImageUrl": IMAGE_URL_PATTERN,
+    "wikipediaUrl": WEB_URL_PATTERN,
+    "wikiavesUrl": WEB_URL_PATTERN,
+}
+
+# Measurements are stored as text, e.g. "13", "13,5" or a range like "10,5-11,5"
+NUMBER_PATTERN = r"\d+(?:,\d+)?(?:-\d+(?:,\d+)?)?"
+NUMERIC_FIELDS = ["sizeLength", "weightG"]
+
+class CatalogValidationError(ValueError):
+    """
+    Raised when a catalog fails validation; `errors` holds every problem found
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(format_report(errors))
+
+def validate_catalog(birds):
+    """
+    Check every bird against the schema in one pass per rule, returning a list of errors
+
+    Each error is a dict with the record `index`, its `id` and `name`, the
+    `field` at fault and a `message`.
+    """
+    if not birds:
+        return []
+    # Object columns keep the raw JSON values, so ints, strings and nulls stay distinguishable
+    df = pd.DataFrame({
+        field: pd.Series([bird.get(field) for bird in birds], dtype=object)
+        for field in ["id"] + TEXT_FIELDS
+    })
+
+    found = []
+
+    def report(mask, field, message):
+        for index in df.index[mask]:
+            found.append((index, field, message))
+
+    # Ids: present, integer and unique
+    ids = df["id"]
+    id_types = ids.map(type)
+    report(ids.isna(), "id", "is missing")
+    report(ids.notna() & (id_types != int), "id", "must be an integer")
+    report(ids.notna() & ids.duplicated(keep=False), "id", "is duplicated")
+
+    for field in TEXT_FIELDS:
+        values = df[field]
+        missing = values.isna()
+        is_text = values.map(type) == str
+        report(~missing & ~is_text, field, "must be a string")
+
+        text = values.where(is_text)
+        blank = text.str.strip().eq("").fillna(False).astype(bool)
+        if field in REQUIRED_FIELDS:
+            report(missing | blank, field, "is required")
+        elif field in URL_FIELDS or field in NUMERIC_FIELDS:
+            # Optional fields may be null, but not an empty string standing in for one
+            report(blank, field, "is empty; use null instead")
+
+        present = is_text & ~blank
+        if field in URL_FIELDS:
+            valid = text.str.fullmatch(URL_FIELDS[field]).fillna(False).astype(bool)
+            report(present & ~valid, field, "is not a valid URL")
+        if field in NUMERIC_FIELDS:
+            valid = text.str.strip().str.fullmatch(NUMBER_PATTERN).fillna(False).astype(bool)
+            report(present & ~valid, field, "is not a number or range")
+
+    names = df["name"].where(df["name"].map(type) == str).str.strip().str.casefold()
+    report(names.notna() & names.duplicated(keep=False), "name", "is duplicated")
+
+    errors = []
+    for index, field, message in sorted(found, key=lambda e: e[0]):
+        bird = birds[index]
+        errors.append({
+            "index": int(index),
+            "id": bird.get("id"),
+            "name": bird.get("name"),
+            "field": field,
+            "message": message,
+        })
+    return errors
+
+def format_report(errors):
+    """
+    Format validation errors as one line per problem
+    """
+    lines = [f"{len(errors)} validation error(s):"]
+    for e in errors:
+        lines.append(f"  record {e['index']} (id={e['id']!r}, name={e['name']!r}): {e['field']} {e['message']}")
+    return "\n".join(lines)
+
+def check_catalog(birds):
+    """
+    Raise CatalogValidationError if the catalog has any validation errors
+    """
+    errors = validate_catalog(birds)
+    if errors:
+        raise CatalogValidationError(errors)
+
+def validate_catalog_file(json_path=JSON_PATH):
+    """
+    Validate the bird data JSON file, printing a report and returning True if it is valid
+    """
+    try:
+        birds = load_birds(json_path)
+    except ValueError as e:
+        # Not JSON, or not a list of bird objects
+        print(f"Error: {str(e)}")
+        return False
+    except Exception as e:
+        print(f"Error reading {json_path}: {str(e)}")
+        return False
+
+    errors = validate_catalog(birds)
+    if errors:
+        print(format_report(errors))
+        return False
+
+    print(f"Validated {len(birds)} birds in {json_path}")
+    return True
+
+if __name__ == "__main__":
+    validate_catalog_file()
@@ -0,0 +1,182 @@
+import os
+import time
+
+from bird_record import load_birds
+from fix_image_urls import fix_bird_image
+from merge_workbooks import (
+    ASSETS_DIR, find_workbooks, merge_records, parse_workbooks, species_key,
+)
+from publish import publish_catalog
+from validate_catalog import CatalogValidationError
+
+JSON_PATH = "bird_data.json"
+
+# Fields copied from the workbooks into bird_data.json. Names are the match
+# keys and images are curated locally, so neither is overwritten here.
+SYNCED_FIELDS = [
+    "family", "description", "identification", "sexualDimorphism", "behavior",
+    "habitat", "diet", "sizeLength", "weightG", "wikipediaUrl", "wikiavesUrl",
+]
+
+# Per-bird enrichment stages re-run for every bird touched by a change
+ENRICHMENT_STAGES = [fix_bird_image]
+
+class CatalogWatcher:
+    """
+    Poll the source workbooks and incrementally republish bird_data.json
+
+    Changes are collected until no workbook has been modified for `debounce`
+    seconds; then only the changed workbooks are re-parsed and only the
+    species whose merged values differ are updated.
+    """
+
+    def __init__(self, assets_dir=ASSETS_DIR, json_path=JSON_PATH, debounce=0.5, interval=0.25):
+        self.assets_dir = assets_dir
+        self.json_path = json_path
+        self.debounce = debounce
+        self.interval = interval
+        self.pending = set()
+        self.last_change = None
+        self.state = self.scan()
+        try:
+            self.parsed = {p[0]: p for p in parse_workbooks(sorted(self.state))}
+        except Exception as e:
+            # Read the workbooks one by one; the unreadable ones are retried on the first poll
+            print(f"Error reading workbooks: {str(e)}")
+            self.parsed = {}
+            self.pending = self._parse(sorted(self.state))
+            self.last_change = float("-inf")
+        self.merged = self._merge()
+
+    def scan(self):
+        """
+        Get the (mtime, size) of every source workbook
+        """
+        state = {}
+        for path in find_workbooks(self.assets_dir):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def _parse(self, paths):
+        """
+        Re-parse the given workbooks one at a time, returning the ones that could not be read
+        """
+        failed = set()
+        for path in paths:
+            try:
+                self.parsed[path] = parse_workbooks([path])[0]
+            except Exception as e:
+                # Editors may still be saving the file
+                print(f"Error reading {path}: {str(e)}")
+                failed.add(path)
+        return failed
+
+    def _merge(self):
+        return {record["key"]: record for record in merge_records(list(self.parsed.values()))}
+
+    def step(self, now=None):
+        """
+        Run one polling step, returning the number of birds updated when a rebuild ran
+        """
+        now = time.monotonic() if now is None else now
+        state = self.scan()
+        changed = {p for p in state.keys() | self.state.keys() if state.get(p) != self.state.get(p)}
+        self.state = state
+
+        if changed:
+            self.pending |= changed
+            self.last_change = now
+            return None
+
+        if self.pending and now - self.last_change >= self.debounce:
+            paths, self.pending = self.pending, set()
+            try:
+                result = self.rebuild(paths)
+            except Exception as e:
+                print(f"Error rebuilding {self.json_path}: {str(e)}")
+                # Keep the changes for a retry
+                self.pending |= paths
+                result = None
+            if self.pending:
+                # Failed paths wait another `debounce` seconds before being retried
+                self.last_change = now
+            return result
+        return None
+
+    def rebuild(self, paths):
+        """
+        Re-parse the given workbooks and publish the birds whose merged values changed
+        """
+        for path in paths - self.state.keys():
+            self.parsed.pop(path, None)
+        # Unreadable workbooks are retried once the debounce has elapsed again
+        self.pending |= self._parse(sorted(paths & self.state.keys()))
+
+        merged = self._merge()
+        changed_keys = {
+            key for key in merged.keys() | self.merged.keys()
+            if _fields(merged.get(key)) != _fields(self.merged.get(key))
+        }
+        if not changed_keys:
+            self.merged = merged
+            return 0
+
+        bird_data = load_birds(self.json_path)
+
+        update_count = 0
+        for bird in bird_data:
+            key = species_key(bird)
+            if key not in changed_keys or key not in merged:
+                continue
+            before = dict(bird)
+            for field in SYNCED_FIELDS:
+                if field in merged[key]:
+                    bird[field] = merged[key][field]
+            # Local images under client/public/birds are never replaced
+            if not bird.get('imageUrl', '').startswith('/birds/'):
+                for stage in ENRICHMENT_STAGES:
+                    stage(bird)
+            if bird != before:
+                update_count += 1
+                print(f"Updated {bird.name}")
+
+        if update_count:
+            try:
+                publish_catalog(bird_data, self.json_path)
+            except CatalogValidationError as e:
+                # self.merged is left as it was, so the next change tries these birds again
+                print(f"Not publishing {self.json_path}: {e}")
+                return 0
+            print(f"Published {update_count} updated birds to {self.json_path}")
+        self.merged = merged
+        return update_count
+
+    def run(self):
+        """
+        Poll until interrupted
+        """
+        print(f"Watching {self.assets_dir} for workbook changes...")
+        try:
+            while True:
+                self.step()
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            print("Stopped watching")
+
+def _fields(record):
+    if record is None:
+        return None
+    return {field: record.get(field) for field in SYNCED_FIELDS}
+
+def watch_catalog(assets_dir=ASSETS_DIR, json_path=JSON_PATH, debounce=0.5):
+    """
+    Watch the source workbooks and keep bird_data.json up to date
+    """
+    CatalogWatcher(assets_dir, json_path, debounce).run()
+
+if __name__ == "__main__":
+    watch_catalog()